@@ -1,140 +1,218 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Literal
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import schemas
 from ..api import deps
+from ..config import get_settings
+from ..database import SessionLocal
+from ..utils.db_pool import pool_stats
+from ..utils.password_hasher import hash_password
+from ..utils.pagination import apply_page_headers
 from ..services import (
     list_admin_users,
     get_admin_user,
     update_admin_user,
     list_admin_novels,
+    count_admin_novels,
     get_admin_novel,
     update_admin_novel,
+    reconcile_novel_stats,
+    rebuild_search_index,
+    compress_chapter_contents,
 )
 
 router = APIRouter(prefix="/admin", tags=["admin"])
+settings = get_settings()
+
+
+def _novel_response(novel) -> schemas.AdminNovelResponse:
+    return schemas.AdminNovelResponse(
+        id=novel.id,
+        title=novel.title,
+        description=novel.description,
+        genre=novel.genre,
+        status=novel.status,
+        tags=novel.tags,
+        cover_image=novel.cover_image,
+        is_banned=novel.is_banned,
+        word_count=novel.word_count,
+        chapter_count=novel.chapter_count,
+        user_id=novel.user_id,
+        user_email=novel.user.email if novel.user else None,
+        user_name=novel.user.name if novel.user else None,
+        created_at=novel.created_at,
+        updated_at=novel.updated_at,
+    )
 
 
 @router.get("/users", response_model=list[schemas.AdminUserResponse])
-def list_users(
-    db: Session = Depends(deps.get_db),
+async def list_users(
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_admin),
 ):
-    return list_admin_users(db)
+    try:
+        page = await db.run_sync(list_admin_users, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return apply_page_headers(response, page)
 
 
 @router.get("/users/{user_id}", response_model=schemas.AdminUserResponse)
-def get_user(
+async def get_user(
     user_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_admin),
 ):
-    user = get_admin_user(db, user_id)
+    user = await db.run_sync(get_admin_user, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
     return user
 
 
 @router.patch("/users/{user_id}", response_model=schemas.AdminUserResponse)
-def update_user(
+async def update_user(
     user_id: str,
     payload: schemas.AdminUserUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_admin),
 ):
-    user = get_admin_user(db, user_id)
+    password_hash = None
+    if payload.password:
+        try:
+            password_hash = await hash_password(payload.password)
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    user = await db.run_sync(get_admin_user, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return update_admin_user(db, user, payload)
+    return await db.run_sync(update_admin_user, user, payload, password_hash)
 
 
 @router.get("/novels", response_model=list[schemas.AdminNovelResponse])
-def list_novels(
-    db: Session = Depends(deps.get_db),
+async def list_novels(
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    is_banned: bool | None = Query(default=None),
+    genre: str | None = Query(default=None),
+    novel_status: str | None = Query(default=None, alias="status"),
+    user_id: str | None = Query(default=None),
+    search: str | None = Query(default=None, max_length=100),
+    sort: Literal["updated_at", "created_at", "title", "word_count", "chapter_count"] = Query(default="updated_at"),
+    order: Literal["asc", "desc"] = Query(default="desc"),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_admin),
 ):
-    novels = list_admin_novels(db)
-    return [
-        schemas.AdminNovelResponse(
-            id=novel.id,
-            title=novel.title,
-            description=novel.description,
-            genre=novel.genre,
-            status=novel.status,
-            tags=novel.tags,
-            cover_image=novel.cover_image,
-            is_banned=novel.is_banned,
-            word_count=novel.word_count,
-            chapter_count=novel.chapter_count,
-            user_id=novel.user_id,
-            user_email=novel.user.email if novel.user else None,
-            user_name=novel.user.name if novel.user else None,
-            created_at=novel.created_at,
-            updated_at=novel.updated_at,
+    filters = dict(is_banned=is_banned, genre=genre, status=novel_status, user_id=user_id, search=search)
+    try:
+        page = await db.run_sync(
+            list_admin_novels, limit, cursor, sort=sort, descending=order == "desc", **filters
         )
-        for novel in novels
-    ]
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if limit is not None and cursor is None:
+        total, capped = await db.run_sync(count_admin_novels, settings.admin_count_cap, **filters)
+        response.headers["X-Total-Count"] = f"{total}+" if capped else str(total)
+    novels = apply_page_headers(response, page)
+    return await db.run_sync(lambda _: [_novel_response(novel) for novel in novels])
+
+
+def _reconcile_all_novel_stats() -> None:
+    db = SessionLocal()
+    try:
+        reconcile_novel_stats(db)
+    finally:
+        db.close()
+
+
+@router.post("/novels/reconcile-stats", response_model=schemas.AdminReconcileResponse)
+async def reconcile_stats(
+    background_tasks: BackgroundTasks,
+    novel_id: str | None = Query(default=None),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user=Depends(deps.get_current_admin),
+):
+    if novel_id:
+        return schemas.AdminReconcileResponse(repaired=await db.run_sync(reconcile_novel_stats, novel_id))
+    background_tasks.add_task(_reconcile_all_novel_stats)
+    return schemas.AdminReconcileResponse(scheduled=True)
+
+
+def _rebuild_full_search_index() -> None:
+    db = SessionLocal()
+    try:
+        rebuild_search_index(db)
+    finally:
+        db.close()
+
+
+@router.post("/search/reindex", response_model=schemas.AdminReindexResponse)
+async def reindex_search(
+    background_tasks: BackgroundTasks,
+    novel_id: str | None = Query(default=None),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user=Depends(deps.get_current_admin),
+):
+    if novel_id:
+        return schemas.AdminReindexResponse(indexed=await db.run_sync(rebuild_search_index, novel_id))
+    background_tasks.add_task(_rebuild_full_search_index)
+    return schemas.AdminReindexResponse(scheduled=True)
+
+
+def _compress_all_chapter_contents() -> None:
+    db = SessionLocal()
+    try:
+        compress_chapter_contents(db)
+    finally:
+        db.close()
+
+
+@router.post("/chapters/compress", response_model=schemas.AdminReconcileResponse)
+async def compress_chapters(
+    background_tasks: BackgroundTasks,
+    current_user=Depends(deps.get_current_admin),
+):
+    background_tasks.add_task(_compress_all_chapter_contents)
+    return schemas.AdminReconcileResponse(scheduled=True)
 
 
 @router.get("/novels/{novel_id}", response_model=schemas.AdminNovelResponse)
-def get_novel(
+async def get_novel(
     novel_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_admin),
 ):
-    novel = get_admin_novel(db, novel_id)
+    novel = await db.run_sync(get_admin_novel, novel_id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
-    return schemas.AdminNovelResponse(
-        id=novel.id,
-        title=novel.title,
-        description=novel.description,
-        genre=novel.genre,
-        status=novel.status,
-        tags=novel.tags,
-        cover_image=novel.cover_image,
-        is_banned=novel.is_banned,
-        word_count=novel.word_count,
-        chapter_count=novel.chapter_count,
-        user_id=novel.user_id,
-        user_email=novel.user.email if novel.user else None,
-        user_name=novel.user.name if novel.user else None,
-        created_at=novel.created_at,
-        updated_at=novel.updated_at,
-    )
+    return await db.run_sync(lambda _: _novel_response(novel))
 
 
 @router.patch("/novels/{novel_id}", response_model=schemas.AdminNovelResponse)
-def update_novel(
+async def update_novel(
     novel_id: str,
     payload: schemas.AdminNovelUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_admin),
 ):
-    novel = get_admin_novel(db, novel_id)
+    novel = await db.run_sync(get_admin_novel, novel_id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
 
     if payload.user_id:
-        owner = get_admin_user(db, payload.user_id)
+        owner = await db.run_sync(get_admin_user, payload.user_id)
         if not owner:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Owner not found")
 
-    updated = update_admin_novel(db, novel, payload)
-    return schemas.AdminNovelResponse(
-        id=updated.id,
-        title=updated.title,
-        description=updated.description,
-        genre=updated.genre,
-        status=updated.status,
-        tags=updated.tags,
-        cover_image=updated.cover_image,
-        is_banned=updated.is_banned,
-        word_count=updated.word_count,
-        chapter_count=updated.chapter_count,
-        user_id=updated.user_id,
-        user_email=updated.user.email if updated.user else None,
-        user_name=updated.user.name if updated.user else None,
-        created_at=updated.created_at,
-        updated_at=updated.updated_at,
-    )
+    updated = await db.run_sync(update_admin_novel, novel, payload)
+    return await db.run_sync(lambda _: _novel_response(updated))
+
+
+@router.get("/metrics/db-pool", response_model=list[schemas.AdminPoolStats])
+async def get_db_pool_metrics(current_user=Depends(deps.get_current_admin)):
+    return pool_stats()
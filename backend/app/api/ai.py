@@ -1,11 +1,23 @@
 import json
 import re
+from typing import Callable
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 
 from .. import schemas
 from ..api import deps
-from ..services.ai_service import WRITING_SYSTEM_PROMPT, doubao_chat, extract_content
+from ..services.ai_service import (
+    WRITING_SYSTEM_PROMPT,
+    doubao_chat,
+    doubao_chat_stream,
+    ensure_doubao_configured,
+    extract_content,
+    lookup_cached_chat,
+    store_cached_chat,
+)
+from ..services.ai_cache import get_response_cache
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
@@ -80,14 +92,173 @@ def _parse_json_from_ai(text: str):
             return json.loads(_escape_control_chars_in_json_strings(cleaned))
 
 
+def _build_refine_response(content: str) -> schemas.RefineResponse:
+    parsed = _parse_json_from_ai(content)
+    refined = (parsed.get("refined") or "").strip()
+    notes = parsed.get("notes")
+    if not refined:
+        raise ValueError("AI 返回内容缺少 refined 字段")
+    if not isinstance(notes, list):
+        notes = []
+    notes = [str(x) for x in notes if str(x).strip()]
+    return schemas.RefineResponse(refined=refined, notes=notes)
+
+
+def _build_review_response(content: str) -> schemas.ReviewResponse:
+    parsed = _parse_json_from_ai(content)
+
+    strengths = parsed.get("strengths") if isinstance(parsed.get("strengths"), list) else []
+    issues = parsed.get("issues") if isinstance(parsed.get("issues"), list) else []
+    suggestions = parsed.get("suggestions") if isinstance(parsed.get("suggestions"), list) else []
+
+    scoring = parsed.get("scoring")
+    scoring_payload = None
+    if isinstance(scoring, dict):
+        scoring_payload = schemas.ReviewScoring(
+            plot=scoring.get("plot"),
+            character=scoring.get("character"),
+            style=scoring.get("style"),
+        )
+
+    payload = schemas.ReviewPayload(
+        strengths=[str(x) for x in strengths if str(x).strip()],
+        issues=[str(x) for x in issues if str(x).strip()],
+        suggestions=[str(x) for x in suggestions if str(x).strip()],
+        scoring=scoring_payload,
+    )
+
+    return schemas.ReviewResponse(review=payload)
+
+
+def _build_deconstruct_response(content: str) -> schemas.DeconstructResponse:
+    parsed = _parse_json_from_ai(content)
+
+    characters = []
+    for item in parsed.get("characters") if isinstance(parsed.get("characters"), list) else []:
+        if isinstance(item, dict):
+            name = str(item.get("name") or "").strip()
+            insight = str(item.get("insight") or "").strip()
+            if name and insight:
+                characters.append(schemas.DeconstructCharacter(name=name, insight=insight))
+
+    analysis = schemas.DeconstructAnalysis(
+        summary=str(parsed.get("summary") or "").strip(),
+        plotBeats=[str(x) for x in (parsed.get("plotBeats") or []) if str(x).strip()]
+        if isinstance(parsed.get("plotBeats"), list)
+        else [],
+        characters=characters,
+        themes=[str(x) for x in (parsed.get("themes") or []) if str(x).strip()]
+        if isinstance(parsed.get("themes"), list)
+        else [],
+        suggestions=[str(x) for x in (parsed.get("suggestions") or []) if str(x).strip()]
+        if isinstance(parsed.get("suggestions"), list)
+        else [],
+    )
+
+    return schemas.DeconstructResponse(analysis=analysis)
+
+
+def _build_naming_response(content: str) -> schemas.NamingResponse:
+    parsed = _parse_json_from_ai(content)
+    suggestions = []
+    for item in parsed.get("suggestions") if isinstance(parsed.get("suggestions"), list) else []:
+        if isinstance(item, dict):
+            name = str(item.get("name") or "").strip()
+            meaning = str(item.get("meaning") or "").strip()
+            if name and meaning:
+                suggestions.append(schemas.NamingSuggestion(name=name, meaning=meaning))
+    return schemas.NamingResponse(suggestions=suggestions)
+
+
+def _bypass_cache(cache_control: str | None) -> tuple[bool, bool]:
+    """Return (skip_lookup, skip_store) for the request's Cache-Control header."""
+    if not cache_control:
+        return False, False
+    directives = {part.strip().lower() for part in cache_control.split(",")}
+    no_store = "no-store" in directives
+    return no_store or "no-cache" in directives, no_store
+
+
+def _sse_event(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _stream_response(
+    messages: list[dict[str, str]],
+    *,
+    temperature: float,
+    max_tokens: int,
+    top_p: float,
+    build: Callable[[str], BaseModel],
+    relay_deltas: bool = True,
+    use_cache: bool = False,
+    refresh_cache: bool = False,
+    no_store: bool = False,
+) -> StreamingResponse:
+    try:
+        ensure_doubao_configured()
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
+
+    async def events():
+        chunks: list[str] = []
+        received = 0
+        try:
+            if use_cache and not refresh_cache:
+                cached = await lookup_cached_chat(messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p)
+                if cached is not None:
+                    yield _sse_event("done", build(extract_content(cached)).model_dump())
+                    return
+
+            async for delta in doubao_chat_stream(messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p):
+                chunks.append(delta)
+                received += len(delta)
+                if relay_deltas:
+                    yield _sse_event("delta", {"content": delta})
+                else:
+                    yield _sse_event("progress", {"received": received})
+            content = "".join(chunks).strip()
+            if not content:
+                raise ValueError("Doubao response missing content.")
+            result = build(content)
+            if use_cache and not no_store:
+                await store_cached_chat(
+                    messages,
+                    {"choices": [{"message": {"role": "assistant", "content": content}}]},
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    top_p=top_p,
+                )
+            yield _sse_event("done", result.model_dump())
+        except Exception as e:
+            yield _sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/chat", response_model=schemas.AIChatResponse)
 async def chat(
     payload: schemas.AIChatRequest,
+    stream: bool = Query(default=False),
     current_user=Depends(deps.get_current_user),
 ):
+    messages = [m.model_dump() for m in payload.messages]
+    if stream:
+        return _stream_response(
+            messages,
+            temperature=payload.temperature,
+            max_tokens=payload.max_tokens,
+            top_p=payload.top_p,
+            build=lambda content: schemas.AIChatResponse(content=content),
+        )
+
     try:
         raw = await doubao_chat(
-            [m.model_dump() for m in payload.messages],
+            messages,
             temperature=payload.temperature,
             max_tokens=payload.max_tokens,
             top_p=payload.top_p,
@@ -102,6 +273,7 @@ async def chat(
 @router.post("/continue-writing", response_model=schemas.ContinueWritingResponse)
 async def continue_writing(
     body: schemas.ContinueWritingRequest,
+    stream: bool = Query(default=False),
     current_user=Depends(deps.get_current_user),
 ):
     if not body.content or not body.content.strip():
@@ -138,19 +310,20 @@ async def continue_writing(
     user_prompt += f"\n\n请续写约{body.length}字的内容。"
 
     max_tokens = min(max(body.length * 2, 256), 2000)
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt},
+    ]
 
-    try:
-        raw = await doubao_chat(
-            [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.8,
-            max_tokens=max_tokens,
-            top_p=0.9,
-        )
-        content = extract_content(raw)
+    def build(content: str) -> schemas.ContinueWritingResponse:
         return schemas.ContinueWritingResponse(content=content, wordCount=len(content))
+
+    if stream:
+        return _stream_response(messages, temperature=0.8, max_tokens=max_tokens, top_p=0.9, build=build)
+
+    try:
+        raw = await doubao_chat(messages, temperature=0.8, max_tokens=max_tokens, top_p=0.9)
+        return build(extract_content(raw))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
     except Exception as e:
@@ -160,6 +333,7 @@ async def continue_writing(
 @router.post("/refine", response_model=schemas.RefineResponse)
 async def refine(
     body: schemas.RefineRequest,
+    stream: bool = Query(default=False),
     current_user=Depends(deps.get_current_user),
 ):
     if not body.content or not body.content.strip():
@@ -190,23 +364,15 @@ async def refine(
         "请按要求返回 JSON。"
     )
 
-    try:
-        raw = await doubao_chat(
-            [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
-            temperature=0.7,
-            max_tokens=2000,
-            top_p=0.9,
+    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+    if stream:
+        return _stream_response(
+            messages, temperature=0.7, max_tokens=2000, top_p=0.9, build=_build_refine_response, relay_deltas=False
         )
-        content = extract_content(raw)
-        parsed = _parse_json_from_ai(content)
-        refined = (parsed.get("refined") or "").strip()
-        notes = parsed.get("notes")
-        if not refined:
-            raise ValueError("AI 返回内容缺少 refined 字段")
-        if not isinstance(notes, list):
-            notes = []
-        notes = [str(x) for x in notes if str(x).strip()]
-        return schemas.RefineResponse(refined=refined, notes=notes)
+
+    try:
+        raw = await doubao_chat(messages, temperature=0.7, max_tokens=2000, top_p=0.9)
+        return _build_refine_response(extract_content(raw))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
     except Exception as e:
@@ -216,6 +382,8 @@ async def refine(
 @router.post("/review", response_model=schemas.ReviewResponse)
 async def review(
     body: schemas.ReviewRequest,
+    stream: bool = Query(default=False),
+    cache_control: str | None = Header(default=None),
     current_user=Depends(deps.get_current_user),
 ):
     if not body.content or not body.content.strip():
@@ -246,37 +414,32 @@ async def review(
         "请按要求输出 JSON 审稿报告。"
     )
 
+    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+    refresh_cache, no_store = _bypass_cache(cache_control)
+    if stream:
+        return _stream_response(
+            messages,
+            temperature=0.6,
+            max_tokens=1600,
+            top_p=0.9,
+            build=_build_review_response,
+            relay_deltas=False,
+            use_cache=True,
+            refresh_cache=refresh_cache,
+            no_store=no_store,
+        )
+
     try:
         raw = await doubao_chat(
-            [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+            messages,
             temperature=0.6,
             max_tokens=1600,
             top_p=0.9,
+            use_cache=True,
+            refresh_cache=refresh_cache,
+            no_store=no_store,
         )
-        content = extract_content(raw)
-        parsed = _parse_json_from_ai(content)
-
-        strengths = parsed.get("strengths") if isinstance(parsed.get("strengths"), list) else []
-        issues = parsed.get("issues") if isinstance(parsed.get("issues"), list) else []
-        suggestions = parsed.get("suggestions") if isinstance(parsed.get("suggestions"), list) else []
-
-        scoring = parsed.get("scoring")
-        scoring_payload = None
-        if isinstance(scoring, dict):
-            scoring_payload = schemas.ReviewScoring(
-                plot=scoring.get("plot"),
-                character=scoring.get("character"),
-                style=scoring.get("style"),
-            )
-
-        payload = schemas.ReviewPayload(
-            strengths=[str(x) for x in strengths if str(x).strip()],
-            issues=[str(x) for x in issues if str(x).strip()],
-            suggestions=[str(x) for x in suggestions if str(x).strip()],
-            scoring=scoring_payload,
-        )
-
-        return schemas.ReviewResponse(review=payload)
+        return _build_review_response(extract_content(raw))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
     except Exception as e:
@@ -286,6 +449,8 @@ async def review(
 @router.post("/deconstruct", response_model=schemas.DeconstructResponse)
 async def deconstruct(
     body: schemas.DeconstructRequest,
+    stream: bool = Query(default=False),
+    cache_control: str | None = Header(default=None),
     current_user=Depends(deps.get_current_user),
 ):
     if not body.content or not body.content.strip():
@@ -322,39 +487,32 @@ async def deconstruct(
         "请直接返回 JSON。"
     )
 
+    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+    refresh_cache, no_store = _bypass_cache(cache_control)
+    if stream:
+        return _stream_response(
+            messages,
+            temperature=0.6,
+            max_tokens=1600,
+            top_p=0.9,
+            build=_build_deconstruct_response,
+            relay_deltas=False,
+            use_cache=True,
+            refresh_cache=refresh_cache,
+            no_store=no_store,
+        )
+
     try:
         raw = await doubao_chat(
-            [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+            messages,
             temperature=0.6,
             max_tokens=1600,
             top_p=0.9,
+            use_cache=True,
+            refresh_cache=refresh_cache,
+            no_store=no_store,
         )
-        content = extract_content(raw)
-        parsed = _parse_json_from_ai(content)
-
-        characters = []
-        for item in parsed.get("characters") if isinstance(parsed.get("characters"), list) else []:
-            if isinstance(item, dict):
-                name = str(item.get("name") or "").strip()
-                insight = str(item.get("insight") or "").strip()
-                if name and insight:
-                    characters.append(schemas.DeconstructCharacter(name=name, insight=insight))
-
-        analysis = schemas.DeconstructAnalysis(
-            summary=str(parsed.get("summary") or "").strip(),
-            plotBeats=[str(x) for x in (parsed.get("plotBeats") or []) if str(x).strip()]
-            if isinstance(parsed.get("plotBeats"), list)
-            else [],
-            characters=characters,
-            themes=[str(x) for x in (parsed.get("themes") or []) if str(x).strip()]
-            if isinstance(parsed.get("themes"), list)
-            else [],
-            suggestions=[str(x) for x in (parsed.get("suggestions") or []) if str(x).strip()]
-            if isinstance(parsed.get("suggestions"), list)
-            else [],
-        )
-
-        return schemas.DeconstructResponse(analysis=analysis)
+        return _build_deconstruct_response(extract_content(raw))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
     except Exception as e:
@@ -364,6 +522,8 @@ async def deconstruct(
 @router.post("/naming", response_model=schemas.NamingResponse)
 async def naming(
     body: schemas.NamingRequest,
+    stream: bool = Query(default=False),
+    cache_control: str | None = Header(default=None),
     current_user=Depends(deps.get_current_user),
 ):
     if not (body.keywords.strip() or body.background.strip()):
@@ -392,23 +552,32 @@ async def naming(
         "请按要求返回 JSON。"
     )
 
+    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+    refresh_cache, no_store = _bypass_cache(cache_control)
+    if stream:
+        return _stream_response(
+            messages,
+            temperature=0.8,
+            max_tokens=1200,
+            top_p=0.9,
+            build=_build_naming_response,
+            relay_deltas=False,
+            use_cache=True,
+            refresh_cache=refresh_cache,
+            no_store=no_store,
+        )
+
     try:
         raw = await doubao_chat(
-            [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
+            messages,
             temperature=0.8,
             max_tokens=1200,
             top_p=0.9,
+            use_cache=True,
+            refresh_cache=refresh_cache,
+            no_store=no_store,
         )
-        content = extract_content(raw)
-        parsed = _parse_json_from_ai(content)
-        suggestions = []
-        for item in parsed.get("suggestions") if isinstance(parsed.get("suggestions"), list) else []:
-            if isinstance(item, dict):
-                name = str(item.get("name") or "").strip()
-                meaning = str(item.get("meaning") or "").strip()
-                if name and meaning:
-                    suggestions.append(schemas.NamingSuggestion(name=name, meaning=meaning))
-        return schemas.NamingResponse(suggestions=suggestions)
+        return _build_naming_response(extract_content(raw))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
     except Exception as e:
@@ -418,6 +587,7 @@ async def naming(
 @router.post("/generate-outline", response_model=schemas.GenerateOutlineResponse)
 async def generate_outline(
     body: schemas.GenerateOutlineRequest,
+    stream: bool = Query(default=False),
     current_user=Depends(deps.get_current_user),
 ):
     if not body.title or not body.title.strip():
@@ -446,15 +616,17 @@ async def generate_outline(
         "请生成可直接使用的大纲正文。"
     )
 
+    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+
+    def build(content: str) -> schemas.GenerateOutlineResponse:
+        return schemas.GenerateOutlineResponse(outline=content)
+
+    if stream:
+        return _stream_response(messages, temperature=0.75, max_tokens=1800, top_p=0.9, build=build)
+
     try:
-        raw = await doubao_chat(
-            [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
-            temperature=0.75,
-            max_tokens=1800,
-            top_p=0.9,
-        )
-        outline = extract_content(raw)
-        return schemas.GenerateOutlineResponse(outline=outline)
+        raw = await doubao_chat(messages, temperature=0.75, max_tokens=1800, top_p=0.9)
+        return build(extract_content(raw))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
     except Exception as e:
@@ -464,6 +636,7 @@ async def generate_outline(
 @router.post("/generate-character", response_model=schemas.GenerateCharacterResponse)
 async def generate_character(
     body: schemas.GenerateCharacterRequest,
+    stream: bool = Query(default=False),
     current_user=Depends(deps.get_current_user),
 ):
     system_prompt = (
@@ -487,15 +660,17 @@ async def generate_character(
         "请生成角色设定正文。"
     )
 
+    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+
+    def build(content: str) -> schemas.GenerateCharacterResponse:
+        return schemas.GenerateCharacterResponse(character=content)
+
+    if stream:
+        return _stream_response(messages, temperature=0.75, max_tokens=1400, top_p=0.9, build=build)
+
     try:
-        raw = await doubao_chat(
-            [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
-            temperature=0.75,
-            max_tokens=1400,
-            top_p=0.9,
-        )
-        character = extract_content(raw)
-        return schemas.GenerateCharacterResponse(character=character)
+        raw = await doubao_chat(messages, temperature=0.75, max_tokens=1400, top_p=0.9)
+        return build(extract_content(raw))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
     except Exception as e:
@@ -505,6 +680,7 @@ async def generate_character(
 @router.post("/generate-world", response_model=schemas.GenerateWorldResponse)
 async def generate_world(
     body: schemas.GenerateWorldRequest,
+    stream: bool = Query(default=False),
     current_user=Depends(deps.get_current_user),
 ):
     system_prompt = (
@@ -533,15 +709,17 @@ async def generate_world(
         "请生成世界观设定正文。"
     )
 
+    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+
+    def build(content: str) -> schemas.GenerateWorldResponse:
+        return schemas.GenerateWorldResponse(world=content)
+
+    if stream:
+        return _stream_response(messages, temperature=0.75, max_tokens=1600, top_p=0.9, build=build)
+
     try:
-        raw = await doubao_chat(
-            [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
-            temperature=0.75,
-            max_tokens=1600,
-            top_p=0.9,
-        )
-        world = extract_content(raw)
-        return schemas.GenerateWorldResponse(world=world)
+        raw = await doubao_chat(messages, temperature=0.75, max_tokens=1600, top_p=0.9)
+        return build(extract_content(raw))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
     except Exception as e:
@@ -551,6 +729,7 @@ async def generate_world(
 @router.post("/generate-draft", response_model=schemas.GenerateDraftResponse)
 async def generate_draft(
     body: schemas.GenerateDraftRequest,
+    stream: bool = Query(default=False),
     current_user=Depends(deps.get_current_user),
 ):
     if not body.prompt or not body.prompt.strip():
@@ -602,14 +781,9 @@ async def generate_draft(
 
     user_prompt = f"创作提示/剧情梗概：\n{body.prompt}\n\n请输出正文。"
 
-    try:
-        raw = await doubao_chat(
-            [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
-            temperature=0.8,
-            max_tokens=length_cfg["max_tokens"],
-            top_p=0.9,
-        )
-        content = extract_content(raw)
+    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+
+    def build(content: str) -> schemas.GenerateDraftResponse:
         metadata = schemas.GenerateDraftMetadata(
             wordCount=len(content),
             genre=genre_label,
@@ -617,7 +791,24 @@ async def generate_draft(
             length=length_cfg["description"],
         )
         return schemas.GenerateDraftResponse(content=content, metadata=metadata)
+
+    if stream:
+        return _stream_response(
+            messages, temperature=0.8, max_tokens=length_cfg["max_tokens"], top_p=0.9, build=build
+        )
+
+    try:
+        raw = await doubao_chat(messages, temperature=0.8, max_tokens=length_cfg["max_tokens"], top_p=0.9)
+        return build(extract_content(raw))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_501_NOT_IMPLEMENTED, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.get("/cache/stats", response_model=schemas.AICacheStats)
+async def cache_stats(current_user=Depends(deps.get_current_admin)):
+    cache = get_response_cache()
+    if cache is None:
+        return schemas.AICacheStats(enabled=False)
+    return schemas.AICacheStats(**cache.stats())
@@ -1,27 +1,32 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import schemas
 from ..api.deps import get_current_user
-from ..database import get_db
+from ..database import get_async_db
 from ..services import authenticate_user, create_user, get_user_by_email
+from ..utils.password_hasher import hash_password
 from ..utils.security import create_access_token
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=schemas.UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_in: schemas.UserCreate, db: Session = Depends(get_db)):
-    if get_user_by_email(db, user_in.email):
+async def register(user_in: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    if await db.run_sync(get_user_by_email, user_in.email):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    user = create_user(db, user_in)
+    try:
+        password_hash = await hash_password(user_in.password)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    user = await db.run_sync(create_user, user_in, password_hash)
     return user
 
 
 @router.post("/login", response_model=schemas.Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect credentials")
     token = create_access_token(user.id)
@@ -29,5 +34,5 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
 
 
 @router.get("/me", response_model=schemas.UserResponse)
-def me(current_user = Depends(get_current_user)):
+async def me(current_user = Depends(get_current_user)):
     return current_user
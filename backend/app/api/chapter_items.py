@@ -1,57 +1,90 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import schemas
 from ..api import deps
-from ..services import delete_chapter, get_chapter, get_novel, update_chapter
+from ..services import (
+    ChapterVersionConflict,
+    delete_chapter,
+    get_chapter,
+    get_novel,
+    patch_chapter,
+    update_chapter,
+)
 
 router = APIRouter(prefix="/chapters", tags=["chapters"])
 
 
 @router.get("/{chapter_id}", response_model=schemas.ChapterResponse)
-def get_by_id(
+async def get_by_id(
     chapter_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
-    chapter = get_chapter(db, current_user.id, chapter_id)
+    chapter = await db.run_sync(get_chapter, current_user.id, chapter_id)
     if not chapter:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
     return chapter
 
 
 @router.put("/{chapter_id}", response_model=schemas.ChapterResponse)
-def update_by_id(
+async def update_by_id(
     chapter_id: str,
     chapter_in: schemas.ChapterUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    chapter = get_chapter(db, current_user.id, chapter_id)
+    chapter = await db.run_sync(get_chapter, current_user.id, chapter_id)
     if not chapter:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
 
-    novel = get_novel(db, chapter.novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, chapter.novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
 
-    return update_chapter(db, novel, chapter, chapter_in)
+    try:
+        return await db.run_sync(update_chapter, novel, chapter, chapter_in)
+    except ChapterVersionConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.patch("/{chapter_id}", response_model=schemas.ChapterResponse)
+async def patch_by_id(
+    chapter_id: str,
+    patch: schemas.ChapterPatch,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user=Depends(deps.get_current_user),
+):
+    chapter = await db.run_sync(get_chapter, current_user.id, chapter_id)
+    if not chapter:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
+
+    novel = await db.run_sync(get_novel, chapter.novel_id, current_user.id)
+    if not novel:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
+
+    try:
+        return await db.run_sync(patch_chapter, novel, chapter, patch)
+    except ChapterVersionConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.delete("/{chapter_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_by_id(
+async def delete_by_id(
     chapter_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    chapter = get_chapter(db, current_user.id, chapter_id)
+    chapter = await db.run_sync(get_chapter, current_user.id, chapter_id)
     if not chapter:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
 
-    novel = get_novel(db, chapter.novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, chapter.novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
 
-    delete_chapter(db, novel, chapter)
+    await db.run_sync(delete_chapter, novel, chapter)
     return None
 
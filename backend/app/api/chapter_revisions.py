@@ -0,0 +1,102 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import schemas
+from ..api import deps
+from ..utils.pagination import apply_page_headers
+from ..services import (
+    ChapterVersionConflict,
+    diff_revision,
+    get_chapter,
+    get_novel,
+    get_revision,
+    list_revisions,
+    restore_chapter_revision,
+    revision_content,
+)
+
+router = APIRouter(prefix="/chapters/{chapter_id}/revisions", tags=["chapter-revisions"])
+
+
+async def _get_chapter_or_404(db: AsyncSession, user_id: str, chapter_id: str):
+    chapter = await db.run_sync(get_chapter, user_id, chapter_id)
+    if not chapter:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
+    return chapter
+
+
+async def _get_revision_or_404(db: AsyncSession, chapter_id: str, number: int):
+    revision = await db.run_sync(get_revision, chapter_id, number)
+    if not revision:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Revision not found")
+    return revision
+
+
+@router.get("/", response_model=list[schemas.ChapterRevisionItem])
+async def list_for_chapter(
+    chapter_id: str,
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user=Depends(deps.get_current_user),
+):
+    await _get_chapter_or_404(db, current_user.id, chapter_id)
+    try:
+        page = await db.run_sync(list_revisions, chapter_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return apply_page_headers(response, page)
+
+
+@router.get("/{number}", response_model=schemas.ChapterRevisionDetail)
+async def get_detail(
+    chapter_id: str,
+    number: int,
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user=Depends(deps.get_current_user),
+):
+    await _get_chapter_or_404(db, current_user.id, chapter_id)
+    revision = await _get_revision_or_404(db, chapter_id, number)
+    content = await db.run_sync(revision_content, revision)
+    return schemas.ChapterRevisionDetail(
+        **schemas.ChapterRevisionItem.model_validate(revision).model_dump(), content=content
+    )
+
+
+@router.get("/{number}/diff", response_model=schemas.ChapterRevisionDiff)
+async def diff_detail(
+    chapter_id: str,
+    number: int,
+    against: int | None = Query(default=None),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user=Depends(deps.get_current_user),
+):
+    chapter = await _get_chapter_or_404(db, current_user.id, chapter_id)
+    revision = await _get_revision_or_404(db, chapter_id, number)
+    try:
+        diff = await db.run_sync(diff_revision, chapter, revision, against)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    return schemas.ChapterRevisionDiff(number=number, against=against, diff=diff)
+
+
+@router.post("/{number}/restore", response_model=schemas.ChapterResponse)
+async def restore(
+    chapter_id: str,
+    number: int,
+    payload: schemas.ChapterRestoreRequest | None = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user=Depends(deps.get_current_user),
+):
+    chapter = await _get_chapter_or_404(db, current_user.id, chapter_id)
+    novel = await db.run_sync(get_novel, chapter.novel_id, current_user.id)
+    if not novel:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
+    revision = await _get_revision_or_404(db, chapter_id, number)
+    try:
+        return await db.run_sync(
+            restore_chapter_revision, novel, chapter, revision, payload.base_version if payload else None
+        )
+    except ChapterVersionConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
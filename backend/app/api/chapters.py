@@ -1,99 +1,198 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import hashlib
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import schemas
 from ..api import deps
-from ..services import create_chapter, delete_chapter, get_chapter, get_novel, list_chapters, reorder_chapters, update_chapter
+from ..utils.pagination import apply_page_headers
+from ..services import (
+    ChapterVersionConflict,
+    create_chapter,
+    delete_chapter,
+    get_chapter,
+    get_chapter_for_move,
+    get_novel,
+    list_chapter_index,
+    list_chapters,
+    move_chapter,
+    patch_chapter,
+    reorder_chapters,
+    update_chapter,
+)
 
 router = APIRouter(prefix="/novels/{novel_id}/chapters", tags=["chapters"])
 
 
+def _index_etag(items: list[schemas.ChapterIndexItem]) -> str:
+    digest = hashlib.sha1()
+    for item in items:
+        line = f"{item.id}|{item.order}|{item.word_count}|{item.status}|{item.updated_at.isoformat()}|{item.title}\n"
+        digest.update(line.encode("utf-8"))
+    return f'W/"{digest.hexdigest()}"'
+
+
 @router.get("/", response_model=list[schemas.ChapterResponse])
-def list_for_novel(
+async def list_for_novel(
+    novel_id: str,
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user=Depends(deps.get_current_user),
+):
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
+    if not novel:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
+    try:
+        page = await db.run_sync(list_chapters, current_user.id, novel_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return apply_page_headers(response, page)
+
+
+@router.get("/index", response_model=list[schemas.ChapterIndexItem])
+async def index_for_novel(
     novel_id: str,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
-    return list_chapters(db, current_user.id, novel_id)
+
+    items = [schemas.ChapterIndexItem.model_validate(c) for c in await db.run_sync(list_chapter_index, current_user.id, novel_id)]
+    etag = _index_etag(items)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body = b"[" + b",".join(item.model_dump_json().encode("utf-8") for item in items) + b"]"
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/", response_model=schemas.ChapterResponse, status_code=status.HTTP_201_CREATED)
-def create_for_novel(
+async def create_for_novel(
     novel_id: str,
     chapter_in: schemas.ChapterCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
-    return create_chapter(db, current_user.id, novel, chapter_in)
+    return await db.run_sync(create_chapter, current_user.id, novel, chapter_in)
 
 
 @router.patch("/reorder", response_model=schemas.ChapterReorderResponse)
-def reorder_for_novel(
+async def reorder_for_novel(
     novel_id: str,
     payload: schemas.ChapterReorderRequest,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
     try:
-        reorder_chapters(db, current_user.id, novel, payload.chapter_ids)
+        await db.run_sync(reorder_chapters, current_user.id, novel, payload.chapter_ids)
         return schemas.ChapterReorderResponse(success=True)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.get("/{chapter_id}", response_model=schemas.ChapterResponse)
-def get_detail(
+async def get_detail(
     novel_id: str,
     chapter_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
-    chapter = get_chapter(db, current_user.id, chapter_id)
+    chapter = await db.run_sync(get_chapter, current_user.id, chapter_id)
     if not chapter or chapter.novel_id != novel_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
     return chapter
 
 
 @router.put("/{chapter_id}", response_model=schemas.ChapterResponse)
-def update_detail(
+async def update_detail(
     novel_id: str,
     chapter_id: str,
     chapter_in: schemas.ChapterUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
 
-    chapter = get_chapter(db, current_user.id, chapter_id)
+    chapter = await db.run_sync(get_chapter, current_user.id, chapter_id)
     if not chapter or chapter.novel_id != novel_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
-    return update_chapter(db, novel, chapter, chapter_in)
+    try:
+        return await db.run_sync(update_chapter, novel, chapter, chapter_in)
+    except ChapterVersionConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+
+@router.post("/{chapter_id}/move", response_model=schemas.ChapterIndexItem)
+async def move_detail(
+    novel_id: str,
+    chapter_id: str,
+    payload: schemas.ChapterMoveRequest,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user=Depends(deps.get_current_user),
+):
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
+    if not novel:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
+
+    chapter = await db.run_sync(get_chapter_for_move, current_user.id, novel_id, chapter_id)
+    if not chapter:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
+    try:
+        return await db.run_sync(move_chapter, novel, chapter, payload.before_id, payload.after_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.patch("/{chapter_id}", response_model=schemas.ChapterResponse)
+async def patch_detail(
+    novel_id: str,
+    chapter_id: str,
+    patch: schemas.ChapterPatch,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user=Depends(deps.get_current_user),
+):
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
+    if not novel:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
+
+    chapter = await db.run_sync(get_chapter, current_user.id, chapter_id)
+    if not chapter or chapter.novel_id != novel_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
+    try:
+        return await db.run_sync(patch_chapter, novel, chapter, patch)
+    except ChapterVersionConflict as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
 @router.delete("/{chapter_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_detail(
+async def delete_detail(
     novel_id: str,
     chapter_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
 
-    chapter = get_chapter(db, current_user.id, chapter_id)
+    chapter = await db.run_sync(get_chapter, current_user.id, chapter_id)
     if not chapter or chapter.novel_id != novel_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Chapter not found")
-    delete_chapter(db, novel, chapter)
+    await db.run_sync(delete_chapter, novel, chapter)
     return None
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import schemas
 from ..api import deps
+from ..utils.pagination import apply_page_headers
 from ..services import (
     create_character,
     delete_character,
@@ -16,75 +17,82 @@ router = APIRouter(prefix="/novels/{novel_id}/characters", tags=["characters"])
 
 
 @router.get("/", response_model=list[schemas.CharacterResponse])
-def list_for_novel(
+async def list_for_novel(
     novel_id: str,
-    db: Session = Depends(deps.get_db),
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
-    return list_characters(db, current_user.id, novel_id)
+    try:
+        page = await db.run_sync(list_characters, current_user.id, novel_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return apply_page_headers(response, page)
 
 
 @router.post("/", response_model=schemas.CharacterResponse, status_code=status.HTTP_201_CREATED)
-def create_for_novel(
+async def create_for_novel(
     novel_id: str,
     character_in: schemas.CharacterCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
-    return create_character(db, current_user.id, novel, character_in)
+    return await db.run_sync(create_character, current_user.id, novel, character_in)
 
 
 @router.get("/{character_id}", response_model=schemas.CharacterResponse)
-def get_detail(
+async def get_detail(
     novel_id: str,
     character_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
-    character = get_character(db, current_user.id, character_id)
+    character = await db.run_sync(get_character, current_user.id, character_id)
     if not character or character.novel_id != novel_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Character not found")
     return character
 
 
 @router.put("/{character_id}", response_model=schemas.CharacterResponse)
-def update_detail(
+async def update_detail(
     novel_id: str,
     character_id: str,
     character_in: schemas.CharacterUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
 
-    character = get_character(db, current_user.id, character_id)
+    character = await db.run_sync(get_character, current_user.id, character_id)
     if not character or character.novel_id != novel_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Character not found")
-    return update_character(db, character, character_in)
+    return await db.run_sync(update_character, character, character_in)
 
 
 @router.delete("/{character_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_detail(
+async def delete_detail(
     novel_id: str,
     character_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
 
-    character = get_character(db, current_user.id, character_id)
+    character = await db.run_sync(get_character, current_user.id, character_id)
     if not character or character.novel_id != novel_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Character not found")
-    delete_character(db, character)
+    await db.run_sync(delete_character, character)
     return None
 
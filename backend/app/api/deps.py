@@ -1,28 +1,45 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
-from ..models import User
+from ..database import ReadAsyncSessionLocal, get_async_db, has_recent_write
+from ..services.user_cache import CachedUser, load_current_user
+from ..utils.query_stats import current_query_stats
 from ..utils.security import decode_token
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)) -> CachedUser:
     token_data = decode_token(token)
     if not token_data.user_id:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-    user = db.query(User).filter(User.id == token_data.user_id).first()
+    user = await load_current_user(db, token_data.user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     if user.is_banned:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User is banned")
+    db.info["user_id"] = user.id
+    stats = current_query_stats()
+    if stats is not None:
+        stats.is_admin = user.is_admin
     return user
 
 
-def get_current_admin(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)) -> User:
-    user = get_current_user(db=db, token=token)
+async def get_read_db(
+    db: AsyncSession = Depends(get_async_db), user: CachedUser = Depends(get_current_user)
+):
+    if ReadAsyncSessionLocal is None or has_recent_write(user.id):
+        yield db
+        return
+    read_db = ReadAsyncSessionLocal()
+    try:
+        yield read_db
+    finally:
+        await read_db.close()
+
+
+async def get_current_admin(user: CachedUser = Depends(get_current_user)) -> CachedUser:
     if not user.is_admin:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
     return user
@@ -1,43 +1,120 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import Literal
+from urllib.parse import quote
+
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import schemas
 from ..api import deps
-from ..services import create_novel, delete_novel, get_novel, list_novels, update_novel
+from ..config import get_settings
+from ..database import read_session_factory
+from ..utils.pagination import apply_page_headers
+from ..services import (
+    EXPORT_FORMATS,
+    bulk_create_chapters,
+    create_novel,
+    delete_novel,
+    export_novel,
+    get_novel,
+    list_novels,
+    parse_manuscript,
+    update_novel,
+)
 
 router = APIRouter(prefix="/novels", tags=["novels"])
+settings = get_settings()
 
 
 @router.get("/", response_model=list[schemas.NovelResponse])
-def get_my_novels(db: Session = Depends(deps.get_db), current_user=Depends(deps.get_current_user)):
-    return list_novels(db, current_user.id)
+async def get_my_novels(
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user=Depends(deps.get_current_user),
+):
+    try:
+        page = await db.run_sync(list_novels, current_user.id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return apply_page_headers(response, page)
 
 
 @router.post("/", response_model=schemas.NovelResponse, status_code=status.HTTP_201_CREATED)
-def create_my_novel(novel_in: schemas.NovelCreate, db: Session = Depends(deps.get_db), current_user=Depends(deps.get_current_user)):
-    return create_novel(db, current_user.id, novel_in)
+async def create_my_novel(novel_in: schemas.NovelCreate, db: AsyncSession = Depends(deps.get_async_db), current_user=Depends(deps.get_current_user)):
+    return await db.run_sync(create_novel, current_user.id, novel_in)
 
 
 @router.get("/{novel_id}", response_model=schemas.NovelResponse)
-def get_detail(novel_id: str, db: Session = Depends(deps.get_db), current_user=Depends(deps.get_current_user)):
-    novel = get_novel(db, novel_id, current_user.id)
+async def get_detail(novel_id: str, db: AsyncSession = Depends(deps.get_read_db), current_user=Depends(deps.get_current_user)):
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
     return novel
 
 
 @router.put("/{novel_id}", response_model=schemas.NovelResponse)
-def update_detail(novel_id: str, novel_in: schemas.NovelUpdate, db: Session = Depends(deps.get_db), current_user=Depends(deps.get_current_user)):
-    novel = get_novel(db, novel_id, current_user.id)
+async def update_detail(novel_id: str, novel_in: schemas.NovelUpdate, db: AsyncSession = Depends(deps.get_async_db), current_user=Depends(deps.get_current_user)):
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
-    return update_novel(db, novel, novel_in)
+    return await db.run_sync(update_novel, novel, novel_in)
 
 
 @router.delete("/{novel_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_detail(novel_id: str, db: Session = Depends(deps.get_db), current_user=Depends(deps.get_current_user)):
-    novel = get_novel(db, novel_id, current_user.id)
+async def delete_detail(novel_id: str, db: AsyncSession = Depends(deps.get_async_db), current_user=Depends(deps.get_current_user)):
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
-    delete_novel(db, novel)
+    await db.run_sync(delete_novel, novel)
     return None
+
+
+@router.post("/{novel_id}/import", response_model=schemas.ChapterImportResponse, status_code=status.HTTP_201_CREATED)
+async def import_manuscript(
+    novel_id: str,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user=Depends(deps.get_current_user),
+):
+    if file.size is not None and file.size > settings.chapter_import_max_bytes:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Manuscript is too large")
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
+    if not novel:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
+    try:
+        chapters = parse_manuscript(
+            file.file,
+            file.filename,
+            file.content_type,
+            settings.chapter_import_heading_pattern,
+            settings.chapter_import_max_bytes,
+        )
+        imported, word_count = await bulk_create_chapters(
+            db, novel, chapters, settings.chapter_import_batch_size
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if not imported:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No chapters found in manuscript")
+    return schemas.ChapterImportResponse(imported=imported, word_count=word_count)
+
+
+@router.get("/{novel_id}/export")
+async def export_manuscript(
+    novel_id: str,
+    export_format: Literal["txt", "md", "epub"] = Query(default="txt", alias="format"),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user=Depends(deps.get_current_user),
+):
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
+    if not novel:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
+    media_type, extension = EXPORT_FORMATS[export_format]
+    filename = quote(f"{novel.title}.{extension}")
+    return StreamingResponse(
+        export_novel(read_session_factory(current_user.id), novel.id, novel.title, novel.description, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=\"novel.{extension}\"; filename*=UTF-8''{filename}"},
+    )
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import schemas
 from ..api import deps
@@ -9,39 +9,39 @@ router = APIRouter(prefix="/outlines", tags=["outlines"])
 
 
 @router.get("/{outline_id}", response_model=schemas.OutlineResponse)
-def get_by_id(
+async def get_by_id(
     outline_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
-    outline = get_outline(db, current_user.id, outline_id)
+    outline = await db.run_sync(get_outline, current_user.id, outline_id)
     if not outline:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Outline not found")
     return outline
 
 
 @router.put("/{outline_id}", response_model=schemas.OutlineResponse)
-def update_by_id(
+async def update_by_id(
     outline_id: str,
     outline_in: schemas.OutlineUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    outline = get_outline(db, current_user.id, outline_id)
+    outline = await db.run_sync(get_outline, current_user.id, outline_id)
     if not outline:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Outline not found")
-    return update_outline(db, outline, outline_in)
+    return await db.run_sync(update_outline, outline, outline_in)
 
 
 @router.delete("/{outline_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_by_id(
+async def delete_by_id(
     outline_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    outline = get_outline(db, current_user.id, outline_id)
+    outline = await db.run_sync(get_outline, current_user.id, outline_id)
     if not outline:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Outline not found")
-    delete_outline(db, outline)
+    await db.run_sync(delete_outline, outline)
     return None
 
@@ -1,83 +1,91 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import schemas
 from ..api import deps
+from ..utils.pagination import apply_page_headers
 from ..services import create_outline, delete_outline, get_novel, get_outline, list_outlines, update_outline
 
 router = APIRouter(prefix="/novels/{novel_id}/outlines", tags=["outlines"])
 
 
 @router.get("/", response_model=list[schemas.OutlineResponse])
-def list_for_novel(
+async def list_for_novel(
     novel_id: str,
-    db: Session = Depends(deps.get_db),
+    response: Response,
+    limit: int | None = Query(default=None, ge=1, le=200),
+    cursor: str | None = Query(default=None),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
-    return list_outlines(db, current_user.id, novel_id)
+    try:
+        page = await db.run_sync(list_outlines, current_user.id, novel_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return apply_page_headers(response, page)
 
 
 @router.post("/", response_model=schemas.OutlineResponse, status_code=status.HTTP_201_CREATED)
-def create_for_novel(
+async def create_for_novel(
     novel_id: str,
     outline_in: schemas.OutlineCreate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
-    return create_outline(db, current_user.id, novel, outline_in)
+    return await db.run_sync(create_outline, current_user.id, novel, outline_in)
 
 
 @router.get("/{outline_id}", response_model=schemas.OutlineResponse)
-def get_detail(
+async def get_detail(
     novel_id: str,
     outline_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
-    outline = get_outline(db, current_user.id, outline_id)
+    outline = await db.run_sync(get_outline, current_user.id, outline_id)
     if not outline or outline.novel_id != novel_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Outline not found")
     return outline
 
 
 @router.put("/{outline_id}", response_model=schemas.OutlineResponse)
-def update_detail(
+async def update_detail(
     novel_id: str,
     outline_id: str,
     outline_in: schemas.OutlineUpdate,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
 
-    outline = get_outline(db, current_user.id, outline_id)
+    outline = await db.run_sync(get_outline, current_user.id, outline_id)
     if not outline or outline.novel_id != novel_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Outline not found")
-    return update_outline(db, outline, outline_in)
+    return await db.run_sync(update_outline, outline, outline_in)
 
 
 @router.delete("/{outline_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_detail(
+async def delete_detail(
     novel_id: str,
     outline_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
 
-    outline = get_outline(db, current_user.id, outline_id)
+    outline = await db.run_sync(get_outline, current_user.id, outline_id)
     if not outline or outline.novel_id != novel_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Outline not found")
-    delete_outline(db, outline)
+    await db.run_sync(delete_outline, outline)
     return None
 
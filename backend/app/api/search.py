@@ -0,0 +1,28 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import schemas
+from ..api import deps
+from ..services import search_documents
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/", response_model=list[schemas.SearchHitResponse])
+async def search(
+    q: str = Query(min_length=1, max_length=100),
+    novel_id: str | None = Query(default=None),
+    doc_type: list[Literal["chapter", "character", "outline", "world_building"]] | None = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=50),
+    db: AsyncSession = Depends(deps.get_read_db),
+    current_user=Depends(deps.get_current_user),
+):
+    try:
+        hits = await db.run_sync(
+            search_documents, current_user.id, q, novel_id=novel_id, doc_types=doc_type, limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    return [hit._asdict() for hit in hits]
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from .. import schemas
 from ..api import deps
@@ -9,39 +9,39 @@ router = APIRouter(prefix="/novels/{novel_id}/world-building", tags=["world-buil
 
 
 @router.get("/", response_model=schemas.WorldBuildingResponse)
-def get_for_novel(
+async def get_for_novel(
     novel_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_read_db),
     current_user=Depends(deps.get_current_user),
 ):
-    wb = get_world_building(db, current_user.id, novel_id)
+    wb = await db.run_sync(get_world_building, current_user.id, novel_id)
     if not wb:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="World building not found")
     return wb
 
 
 @router.put("/", response_model=schemas.WorldBuildingResponse)
-def upsert_for_novel(
+async def upsert_for_novel(
     novel_id: str,
     payload: schemas.WorldBuildingUpsert,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    novel = get_novel(db, novel_id, current_user.id)
+    novel = await db.run_sync(get_novel, novel_id, current_user.id)
     if not novel:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Novel not found")
-    return upsert_world_building(db, current_user.id, novel, payload)
+    return await db.run_sync(upsert_world_building, current_user.id, novel, payload)
 
 
 @router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
-def delete_for_novel(
+async def delete_for_novel(
     novel_id: str,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db),
     current_user=Depends(deps.get_current_user),
 ):
-    wb = get_world_building(db, current_user.id, novel_id)
+    wb = await db.run_sync(get_world_building, current_user.id, novel_id)
     if not wb:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="World building not found")
-    delete_world_building(db, wb)
+    await db.run_sync(delete_world_building, wb)
     return None
 
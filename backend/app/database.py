@@ -1,28 +1,202 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from .config import get_settings
+from .utils.db_pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine
 
 settings = get_settings()
 
 
-def _build_engine(database_url: str):
+_ASYNC_DRIVERS = {
+    "mysql+pymysql://": "mysql+aiomysql://",
+    "mysql+mysqldb://": "mysql+aiomysql://",
+    "mysql://": "mysql+aiomysql://",
+}
+
+
+def _pool_options(pool_size: int, max_overflow: int) -> dict:
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.database_pool_timeout_seconds,
+        "pool_recycle": settings.database_pool_recycle_seconds,
+        "pool_pre_ping": settings.database_pool_pre_ping == "always",
+    }
+
+
+def _build_engine(database_url: str, name: str = "primary"):
+    if database_url.startswith("sqlite"):
+        raise ValueError("SQLite is not supported. Please configure MySQL via DATABASE_URL.")
+    # Requests go through the async engine; the sync one only serves admin
+    # background jobs, the search indexer and migrations, so it keeps a small pool.
+    engine = create_engine(
+        database_url,
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name=name,
+        **_pool_options(settings.database_sync_pool_size, settings.database_sync_max_overflow),
+    )
+    instrument_engine(engine, name)
+    return engine
+
+
+def _async_database_url(database_url: str) -> str:
+    for prefix, async_prefix in _ASYNC_DRIVERS.items():
+        if database_url.startswith(prefix):
+            return async_prefix + database_url[len(prefix) :]
+    return database_url
+
+
+def _build_async_engine(
+    database_url: str, name: str = "primary_async", pool_size: int | None = None, max_overflow: int | None = None
+):
     if database_url.startswith("sqlite"):
         raise ValueError("SQLite is not supported. Please configure MySQL via DATABASE_URL.")
-    return create_engine(database_url, pool_pre_ping=True, pool_recycle=3600)
+    engine = create_async_engine(
+        database_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_logging_name=name,
+        **_pool_options(
+            settings.database_pool_size if pool_size is None else pool_size,
+            settings.database_max_overflow if max_overflow is None else max_overflow,
+        ),
+    )
+    instrument_engine(engine.sync_engine, name)
+    return engine
 
 
 engine = _build_engine(settings.database_url)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+
+class _PrimarySession(Session):
+    pass
+
+
+@event.listens_for(_PrimarySession, "after_flush")
+def _mark_flush_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(_PrimarySession, "do_orm_execute")
+def _mark_statement_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+async_engine = _build_async_engine(settings.database_async_url or _async_database_url(settings.database_url))
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=_PrimarySession,
+)
+
+read_async_engine = (
+    _build_async_engine(
+        _async_database_url(settings.database_read_url),
+        "replica_async",
+        settings.database_read_pool_size,
+        settings.database_read_max_overflow,
+    )
+    if settings.database_read_url
+    else None
+)
+ReadAsyncSessionLocal = (
+    async_sessionmaker(read_async_engine, autoflush=False, expire_on_commit=False, class_=AsyncSession)
+    if read_async_engine is not None
+    else None
+)
+
+_recent_writers: dict[str, float] = {}
+
+
+def note_user_write(user_id: str) -> None:
+    now = time.monotonic()
+    if len(_recent_writers) > 10000:
+        for key, deadline in list(_recent_writers.items()):
+            if deadline <= now:
+                _recent_writers.pop(key, None)
+    _recent_writers[user_id] = now + settings.database_read_your_writes_seconds
+
+
+def has_recent_write(user_id: str) -> bool:
+    deadline = _recent_writers.get(user_id)
+    if deadline is None:
+        return False
+    if deadline <= time.monotonic():
+        _recent_writers.pop(user_id, None)
+        return False
+    return True
+
+
+def read_session_factory(user_id: str) -> async_sessionmaker:
+    if ReadAsyncSessionLocal is None or has_recent_write(user_id):
+        return AsyncSessionLocal
+    return ReadAsyncSessionLocal
 
 
 class Base(DeclarativeBase):
     pass
 
 
+_MIGRATION_LOCK = "qingxie_schema_migration"
+
+
+def upgrade_database() -> None:
+    from alembic import command
+    from alembic.config import Config
+
+    backend_dir = Path(__file__).resolve().parents[1]
+    config = Config(str(backend_dir / "alembic.ini"))
+    config.set_main_option("script_location", str(backend_dir / "migrations"))
+    config.attributes["configure_logger"] = False
+    with engine.connect() as connection:
+        # Several workers may boot at once; only one of them runs the migrations.
+        locking = connection.dialect.name == "mysql"
+        if locking:
+            acquired = connection.execute(
+                text("SELECT GET_LOCK(:name, :timeout)"), {"name": _MIGRATION_LOCK, "timeout": 600}
+            ).scalar()
+            connection.commit()
+            if acquired != 1:
+                raise RuntimeError("Timed out waiting for the schema migration lock.")
+        try:
+            with connection.begin():
+                config.attributes["connection"] = connection
+                command.upgrade(config, "head")
+        finally:
+            if locking:
+                connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": _MIGRATION_LOCK})
+                connection.commit()
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
+
+
+async def get_async_db():
+    db = AsyncSessionLocal()
+    try:
+        yield db
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+    if db.info.get("wrote") and db.info.get("user_id"):
+        note_user_write(db.info["user_id"])
@@ -1,12 +1,19 @@
+import asyncio
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from .api import api_router
 from .config import get_settings
-from .database import Base, engine
+from .database import async_engine, read_async_engine, upgrade_database
 from . import models
+from .middleware import MetricsMiddleware, SQLProfileMiddleware
+from .services.ai_service import close_http_client, get_http_client
+from .services.search_service import flush_search_index
+from .utils.metrics import render_metrics
+from .utils.password_hasher import PasswordHasherBusy, shutdown_password_hasher, start_password_hasher
 
 
 settings = get_settings()
@@ -14,8 +21,17 @@ settings = get_settings()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    Base.metadata.create_all(bind=engine)
+    if settings.database_auto_migrate:
+        upgrade_database()
+    get_http_client()
+    await start_password_hasher()
     yield
+    await asyncio.to_thread(flush_search_index)
+    shutdown_password_hasher()
+    await close_http_client()
+    await async_engine.dispose()
+    if read_async_engine is not None:
+        await read_async_engine.dispose()
 
 
 app = FastAPI(title=settings.app_name, lifespan=lifespan)
@@ -26,7 +42,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Total-Count", "X-SQL-Count", "X-SQL-Time-Ms", "X-SQL-Repeated"],
 )
+app.add_middleware(
+    SQLProfileMiddleware,
+    always=settings.sql_profiling_enabled,
+    repeat_threshold=settings.sql_profiling_repeat_threshold,
+)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"detail": str(exc)}, headers={"Retry-After": "1"})
 
 
 @app.get("/health")
@@ -34,4 +63,11 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    if not settings.metrics_enabled:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
 app.include_router(api_router)
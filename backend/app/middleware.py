@@ -0,0 +1,115 @@
+import logging
+import time
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .utils.metrics import (
+    HTTP_DB_SECONDS,
+    HTTP_IN_FLIGHT,
+    HTTP_REQUEST_SECONDS,
+    HTTP_REQUESTS,
+    HTTP_RESPONSE_BYTES,
+)
+from .utils.query_stats import QueryStats, begin_query_stats, current_query_stats, end_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+def route_template(app, scope: Scope) -> str:
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope["app"], scope)
+        status_code = 500
+        response_bytes = 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_bytes += len(message.get("body", b""))
+            await send(message)
+
+        in_flight = HTTP_IN_FLIGHT.labels(method, route)
+        stats = current_query_stats() or QueryStats()
+        token = begin_query_stats(stats)
+        in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_flight.dec()
+            end_query_stats(token)
+            HTTP_REQUESTS.labels(method, route, status_code).inc()
+            HTTP_REQUEST_SECONDS.labels(method, route).observe(elapsed)
+            HTTP_RESPONSE_BYTES.labels(method, route).observe(response_bytes)
+            HTTP_DB_SECONDS.labels(method, route).observe(stats.seconds)
+
+
+class SQLProfileMiddleware:
+    def __init__(self, app: ASGIApp, always: bool = False, repeat_threshold: int = 5, header: str = "x-sql-profile"):
+        self.app = app
+        self.always = always
+        self.repeat_threshold = repeat_threshold
+        self.header = header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        requested = self.header in Headers(scope=scope)
+        if not (self.always or requested):
+            await self.app(scope, receive, send)
+            return
+
+        stats = current_query_stats() or QueryStats()
+        stats.track_shapes()
+        token = begin_query_stats(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and (self.always or stats.is_admin):
+                headers = MutableHeaders(scope=message)
+                headers["X-SQL-Count"] = str(stats.count)
+                headers["X-SQL-Time-Ms"] = f"{stats.seconds * 1000:.1f}"
+                repeated = stats.repeated()
+                if repeated:
+                    summary = "; ".join(f"{count}x {shape[:120]}" for shape, count in repeated[:3])
+                    headers["X-SQL-Repeated"] = summary.encode("ascii", "replace").decode("ascii")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            end_query_stats(token)
+            self._log(scope, stats)
+
+    def _log(self, scope: Scope, stats: QueryStats) -> None:
+        repeated = stats.repeated(self.repeat_threshold)
+        summary = "%s %s: %d statements, %.1f ms"
+        args = (scope["method"], scope["path"], stats.count, stats.seconds * 1000)
+        if repeated:
+            logger.warning(
+                summary + ", repeated shapes (possible N+1): %s",
+                *args,
+                "; ".join(f"{count}x {shape}" for shape, count in repeated),
+            )
+        else:
+            logger.info(summary, *args)
@@ -1,15 +1,19 @@
 from .user import User
 from .novel import Novel
 from .chapter import Chapter
+from .chapter_revision import ChapterRevision
 from .character import Character
 from .outline import Outline
 from .world_building import WorldBuilding
+from .search_posting import SearchPosting
 
 __all__ = [
     "User",
     "Novel",
     "Chapter",
+    "ChapterRevision",
     "Character",
     "Outline",
     "WorldBuilding",
+    "SearchPosting",
 ]
@@ -1,22 +1,27 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, Text
+from sqlalchemy.orm import deferred, relationship
 
 from ..database import Base
+from .types import CompressedText
 
 
 class Chapter(Base):
     __tablename__ = "chapters"
+    __table_args__ = (Index("ix_chapters_novel_order_created", "novel_id", "order", "created_at"),)
 
     id = Column(String(36), primary_key=True, index=True)
     title = Column(String(255), nullable=False)
-    content = Column(Text, nullable=False)
+    content = deferred(Column(CompressedText, nullable=False))
     summary = Column(Text, nullable=True)
     word_count = Column(Integer, default=0)
     order = Column(Integer, default=0)
     status = Column(String(50), default="draft")
+    version = Column(Integer, nullable=False, default=1)
     novel_id = Column(String(36), ForeignKey("novels.id", ondelete="CASCADE"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     novel = relationship("Novel", back_populates="chapters")
+
+    __mapper_args__ = {"version_id_col": version, "version_id_generator": False}
@@ -0,0 +1,22 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, LargeBinary, String, UniqueConstraint
+from sqlalchemy.dialects import mysql
+
+from ..database import Base
+
+
+class ChapterRevision(Base):
+    __tablename__ = "chapter_revisions"
+    __table_args__ = (UniqueConstraint("chapter_id", "number", name="uq_chapter_revisions_chapter_number"),)
+
+    id = Column(String(36), primary_key=True)
+    chapter_id = Column(String(36), ForeignKey("chapters.id", ondelete="CASCADE"), nullable=False)
+    number = Column(Integer, nullable=False)
+    kind = Column(String(10), nullable=False)
+    base_number = Column(Integer, nullable=False)
+    payload = Column(LargeBinary().with_variant(mysql.MEDIUMBLOB(), "mysql"), nullable=False)
+    title = Column(String(255), nullable=False)
+    word_count = Column(Integer, default=0)
+    chapter_version = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
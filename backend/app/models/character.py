@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -7,6 +7,7 @@ from ..database import Base
 
 class Character(Base):
     __tablename__ = "characters"
+    __table_args__ = (Index("ix_characters_novel_created", "novel_id", "created_at"),)
 
     id = Column(String(36), primary_key=True, index=True)
     name = Column(String(255), nullable=False)
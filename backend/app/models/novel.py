@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, String, Integer, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, String, Integer, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -7,6 +7,11 @@ from ..database import Base
 
 class Novel(Base):
     __tablename__ = "novels"
+    __table_args__ = (
+        Index("ix_novels_user_banned_created", "user_id", "is_banned", "created_at"),
+        Index("ix_novels_updated", "updated_at"),
+        Index("ix_novels_created", "created_at"),
+    )
 
     id = Column(String(36), primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, Text
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -7,6 +7,7 @@ from ..database import Base
 
 class Outline(Base):
     __tablename__ = "outlines"
+    __table_args__ = (Index("ix_outlines_novel_order_created", "novel_id", "order", "created_at"),)
 
     id = Column(String(36), primary_key=True, index=True)
     title = Column(String(255), nullable=False)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, ForeignKey, Index, Integer, String
+
+from ..database import Base
+
+
+class SearchPosting(Base):
+    __tablename__ = "search_postings"
+    __table_args__ = (Index("ix_search_postings_doc", "doc_type", "doc_id"),)
+
+    novel_id = Column(String(36), ForeignKey("novels.id", ondelete="CASCADE"), primary_key=True)
+    term = Column(String(32), primary_key=True)
+    doc_type = Column(String(20), primary_key=True)
+    doc_id = Column(String(36), primary_key=True)
+    weight = Column(Integer, nullable=False, default=1)
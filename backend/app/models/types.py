@@ -0,0 +1,36 @@
+from sqlalchemy import LargeBinary
+from sqlalchemy.dialects import mysql
+from sqlalchemy.types import TypeDecorator
+
+from ..config import get_settings
+from ..utils.compression import compress_text, decompress_text, is_compressed
+
+
+class CompressedText(TypeDecorator):
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "mysql":
+            return dialect.type_descriptor(mysql.MEDIUMBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        settings = get_settings()
+        return compress_text(
+            value,
+            codec=settings.content_compression,
+            level=settings.content_compression_level,
+            min_size=settings.content_compression_min_bytes,
+        )
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        value = bytes(value)
+        # Rows converted from TEXT hold plain UTF-8 until the backfill rewrites them.
+        if is_compressed(value):
+            return decompress_text(value)
+        return value.decode("utf-8")
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, String, DateTime
+from sqlalchemy import Boolean, Column, String, DateTime, Index
 from sqlalchemy.orm import relationship
 
 from ..database import Base
@@ -7,6 +7,7 @@ from ..database import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_created", "created_at"),)
 
     id = Column(String(36), primary_key=True, index=True)
     email = Column(String(255), unique=True, nullable=False, index=True)
@@ -1,12 +1,29 @@
 from .user import UserCreate, UserLogin, UserResponse, Token, TokenData
 from .novel import NovelCreate, NovelResponse, NovelUpdate
-from .chapter import ChapterCreate, ChapterResponse, ChapterUpdate, ChapterReorderRequest, ChapterReorderResponse
+from .chapter import (
+    ChapterCreate,
+    ChapterResponse,
+    ChapterUpdate,
+    ChapterTextOp,
+    ChapterPatch,
+    ChapterIndexItem,
+    ChapterReorderRequest,
+    ChapterReorderResponse,
+    ChapterMoveRequest,
+    ChapterImportResponse,
+    ChapterRevisionItem,
+    ChapterRevisionDetail,
+    ChapterRevisionDiff,
+    ChapterRestoreRequest,
+)
 from .character import CharacterCreate, CharacterResponse, CharacterUpdate
 from .outline import OutlineCreate, OutlineResponse, OutlineUpdate
 from .world_building import WorldBuildingResponse, WorldBuildingUpsert
+from .search import SearchHitResponse
 from .ai import (
     AIChatRequest,
     AIChatResponse,
+    AICacheStats,
     ContinueWritingRequest,
     ContinueWritingResponse,
     RefineRequest,
@@ -32,7 +49,16 @@ from .ai import (
     GenerateDraftResponse,
     GenerateDraftMetadata,
 )
-from .admin import AdminUserResponse, AdminUserUpdate, AdminNovelResponse, AdminNovelUpdate
+from .admin import (
+    AdminUserResponse,
+    AdminUserUpdate,
+    AdminNovelResponse,
+    AdminNovelUpdate,
+    AdminReconcileResponse,
+    AdminReindexResponse,
+    AdminHistogram,
+    AdminPoolStats,
+)
 
 __all__ = [
     "UserCreate",
@@ -46,8 +72,17 @@ __all__ = [
     "ChapterCreate",
     "ChapterResponse",
     "ChapterUpdate",
+    "ChapterTextOp",
+    "ChapterPatch",
+    "ChapterIndexItem",
     "ChapterReorderRequest",
     "ChapterReorderResponse",
+    "ChapterMoveRequest",
+    "ChapterImportResponse",
+    "ChapterRevisionItem",
+    "ChapterRevisionDetail",
+    "ChapterRevisionDiff",
+    "ChapterRestoreRequest",
     "CharacterCreate",
     "CharacterResponse",
     "CharacterUpdate",
@@ -56,8 +91,10 @@ __all__ = [
     "OutlineUpdate",
     "WorldBuildingResponse",
     "WorldBuildingUpsert",
+    "SearchHitResponse",
     "AIChatRequest",
     "AIChatResponse",
+    "AICacheStats",
     "ContinueWritingRequest",
     "ContinueWritingResponse",
     "RefineRequest",
@@ -86,4 +123,8 @@ __all__ = [
     "AdminUserUpdate",
     "AdminNovelResponse",
     "AdminNovelUpdate",
+    "AdminReconcileResponse",
+    "AdminReindexResponse",
+    "AdminHistogram",
+    "AdminPoolStats",
 ]
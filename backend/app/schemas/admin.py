@@ -54,3 +54,33 @@ class AdminNovelUpdate(BaseModel):
     cover_image: Optional[str] = None
     user_id: Optional[str] = None
     is_banned: Optional[bool] = None
+
+
+class AdminReconcileResponse(BaseModel):
+    repaired: Optional[int] = None
+    scheduled: bool = False
+
+
+class AdminReindexResponse(BaseModel):
+    indexed: Optional[int] = None
+    scheduled: bool = False
+
+
+class AdminHistogram(BaseModel):
+    buckets: list[tuple[float, int]]
+    count: int
+    sum: float
+
+
+class AdminPoolStats(BaseModel):
+    name: str
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    checkins: int
+    connects: int
+    invalidations: int
+    timeouts: int
+    wait_seconds: AdminHistogram
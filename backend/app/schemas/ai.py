@@ -20,6 +20,19 @@ class AIChatResponse(BaseModel):
     raw: dict | None = None
 
 
+class AICacheStats(BaseModel):
+    enabled: bool
+    entries: int = 0
+    max_entries: int = 0
+    ttl_seconds: float = 0
+    disk_enabled: bool = False
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    hit_rate: float = 0.0
+
+
 class ContinueWritingRequest(BaseModel):
     content: str
     context: Optional[str] = None
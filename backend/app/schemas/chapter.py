@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class ChapterBase(BaseModel):
@@ -22,11 +22,27 @@ class ChapterUpdate(BaseModel):
     summary: Optional[str] = None
     order: Optional[int] = None
     status: Optional[str] = None
+    base_version: Optional[int] = None
+
+
+class ChapterTextOp(BaseModel):
+    start: int = Field(ge=0)
+    end: int = Field(ge=0)
+    text: str = ""
+
+
+class ChapterPatch(BaseModel):
+    base_version: int
+    ops: list[ChapterTextOp] = Field(default_factory=list, max_length=1000)
+    title: Optional[str] = None
+    summary: Optional[str] = None
+    status: Optional[str] = None
 
 
 class ChapterResponse(ChapterBase):
     id: str
     word_count: int
+    version: int = 1
     novel_id: str
     created_at: datetime
     updated_at: datetime
@@ -35,9 +51,58 @@ class ChapterResponse(ChapterBase):
         from_attributes = True
 
 
+class ChapterIndexItem(BaseModel):
+    id: str
+    title: str
+    order: int
+    word_count: int
+    status: str
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class ChapterReorderRequest(BaseModel):
     chapter_ids: list[str]
 
 
+class ChapterMoveRequest(BaseModel):
+    before_id: Optional[str] = None
+    after_id: Optional[str] = None
+
+
 class ChapterReorderResponse(BaseModel):
     success: bool = True
+
+
+class ChapterImportResponse(BaseModel):
+    imported: int
+    word_count: int
+
+
+class ChapterRevisionItem(BaseModel):
+    number: int
+    kind: str
+    title: str
+    word_count: int = 0
+    chapter_version: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ChapterRevisionDetail(ChapterRevisionItem):
+    content: str
+
+
+class ChapterRevisionDiff(BaseModel):
+    number: int
+    against: Optional[int] = None
+    diff: str
+
+
+class ChapterRestoreRequest(BaseModel):
+    base_version: Optional[int] = None
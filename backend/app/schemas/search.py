@@ -0,0 +1,17 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class SearchHitResponse(BaseModel):
+    doc_type: Literal["chapter", "character", "outline", "world_building"]
+    id: str
+    novel_id: str
+    title: str
+    field: str
+    snippet: str
+    highlights: list[tuple[int, int]]
+    score: float
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,24 @@
-from .auth_service import authenticate_user, create_user, get_user_by_email
+from .auth_service import authenticate_user, create_user, get_user_by_email, set_user_password
 from .novel_service import create_novel, delete_novel, get_novel, list_novels, update_novel
-from .chapter_service import create_chapter, delete_chapter, get_chapter, list_chapters, reorder_chapters, update_chapter
+from .chapter_service import (
+    ChapterVersionConflict,
+    bulk_create_chapters,
+    compress_chapter_contents,
+    create_chapter,
+    delete_chapter,
+    get_chapter,
+    get_chapter_for_move,
+    list_chapter_index,
+    list_chapters,
+    move_chapter,
+    patch_chapter,
+    rebalance_chapter_order,
+    reconcile_novel_stats,
+    reorder_chapters,
+    restore_chapter_revision,
+    update_chapter,
+)
+from .revision_service import diff_revision, get_revision, list_revisions, revision_content
 from .character_service import create_character, delete_character, get_character, list_characters, update_character
 from .outline_service import create_outline, delete_outline, get_outline, list_outlines, update_outline
 from .world_building_service import (
@@ -8,6 +26,7 @@ from .world_building_service import (
     get_world_building,
     get_world_building_by_id,
     list_world_buildings,
+    update_world_building,
     upsert_world_building,
 )
 from .admin_service import (
@@ -15,24 +34,43 @@ from .admin_service import (
     get_admin_user,
     update_admin_user,
     list_admin_novels,
+    count_admin_novels,
     get_admin_novel,
     update_admin_novel,
 )
+from .search_service import flush_search_index, rebuild_search_index, search_documents
+from .import_service import parse_manuscript
+from .export_service import EXPORT_FORMATS, export_novel
 
 __all__ = [
     "authenticate_user",
     "create_user",
     "get_user_by_email",
+    "set_user_password",
     "create_novel",
     "delete_novel",
     "get_novel",
     "list_novels",
     "update_novel",
+    "ChapterVersionConflict",
+    "bulk_create_chapters",
+    "compress_chapter_contents",
     "create_chapter",
     "delete_chapter",
     "get_chapter",
+    "get_chapter_for_move",
+    "list_chapter_index",
     "list_chapters",
+    "move_chapter",
+    "patch_chapter",
+    "rebalance_chapter_order",
+    "reconcile_novel_stats",
     "reorder_chapters",
+    "restore_chapter_revision",
+    "diff_revision",
+    "get_revision",
+    "list_revisions",
+    "revision_content",
     "update_chapter",
     "create_character",
     "delete_character",
@@ -48,11 +86,19 @@ __all__ = [
     "get_world_building",
     "get_world_building_by_id",
     "list_world_buildings",
+    "update_world_building",
     "upsert_world_building",
     "list_admin_users",
     "get_admin_user",
     "update_admin_user",
     "list_admin_novels",
+    "count_admin_novels",
     "get_admin_novel",
     "update_admin_novel",
+    "flush_search_index",
+    "rebuild_search_index",
+    "search_documents",
+    "parse_manuscript",
+    "EXPORT_FORMATS",
+    "export_novel",
 ]
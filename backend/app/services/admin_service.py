@@ -1,39 +1,97 @@
-from typing import List
-
-from sqlalchemy.orm import Session
+from sqlalchemy import func
+from sqlalchemy.orm import Query, Session, contains_eager, joinedload
 
 from ..models import Novel, User
 from ..schemas import AdminNovelUpdate, AdminUserUpdate
-from ..utils.security import get_password_hash
+from ..utils.pagination import Page, paginate
+from .user_cache import invalidate_user
 
 
-def list_admin_users(db: Session) -> List[User]:
-    return db.query(User).order_by(User.created_at.desc()).all()
+def list_admin_users(db: Session, limit: int | None = None, cursor: str | None = None) -> Page:
+    return paginate(db.query(User), [(User.created_at, True), (User.id, True)], limit, cursor)
 
 
 def get_admin_user(db: Session, user_id: str) -> User | None:
     return db.query(User).filter(User.id == user_id).first()
 
 
-def update_admin_user(db: Session, user: User, payload: AdminUserUpdate) -> User:
+def update_admin_user(db: Session, user: User, payload: AdminUserUpdate, password_hash: str | None = None) -> User:
     data = payload.model_dump(exclude_unset=True)
-    password = data.pop("password", None)
-    if password:
-        user.password = get_password_hash(password)
+    data.pop("password", None)
+    if password_hash:
+        user.password = password_hash
     for field, value in data.items():
         setattr(user, field, value)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
+    invalidate_user(db, user.id)
     return user
 
 
-def list_admin_novels(db: Session) -> List[Novel]:
-    return db.query(Novel).order_by(Novel.updated_at.desc()).all()
+ADMIN_NOVEL_SORTS = {
+    "updated_at": Novel.updated_at,
+    "created_at": Novel.created_at,
+    "title": Novel.title,
+    "word_count": Novel.word_count,
+    "chapter_count": Novel.chapter_count,
+}
+
+
+def _filter_admin_novels(
+    query: Query,
+    *,
+    is_banned: bool | None = None,
+    genre: str | None = None,
+    status: str | None = None,
+    user_id: str | None = None,
+    search: str | None = None,
+) -> Query:
+    if is_banned is not None:
+        query = query.filter(Novel.is_banned == is_banned)
+    if genre:
+        query = query.filter(Novel.genre == genre)
+    if status:
+        query = query.filter(Novel.status == status)
+    if user_id:
+        query = query.filter(Novel.user_id == user_id)
+    if search:
+        query = query.filter(Novel.title.contains(search, autoescape=True))
+    return query
+
+
+def list_admin_novels(
+    db: Session,
+    limit: int | None = None,
+    cursor: str | None = None,
+    *,
+    sort: str = "updated_at",
+    descending: bool = True,
+    **filters,
+) -> Page:
+    if sort not in ADMIN_NOVEL_SORTS:
+        raise ValueError("Invalid sort")
+    query = (
+        db.query(Novel)
+        .outerjoin(Novel.user)
+        .options(contains_eager(Novel.user).load_only(User.id, User.email, User.name))
+    )
+    query = _filter_admin_novels(query, **filters)
+    return paginate(query, [(ADMIN_NOVEL_SORTS[sort], descending), (Novel.id, descending)], limit, cursor)
+
+
+def count_admin_novels(db: Session, cap: int, **filters) -> tuple[int, bool]:
+    matches = _filter_admin_novels(db.query(Novel.id), **filters).limit(cap + 1).subquery()
+    total = db.query(func.count()).select_from(matches).scalar()
+    return min(total, cap), total > cap
 
 
 def get_admin_novel(db: Session, novel_id: str) -> Novel | None:
-    return db.query(Novel).filter(Novel.id == novel_id).first()
+    return (
+        db.query(Novel)
+        .options(joinedload(Novel.user).load_only(User.id, User.email, User.name))
+        .filter(Novel.id == novel_id)
+        .first()
+    )
 
 
 def update_admin_novel(db: Session, novel: Novel, payload: AdminNovelUpdate) -> Novel:
@@ -41,6 +99,7 @@ def update_admin_novel(db: Session, novel: Novel, payload: AdminNovelUpdate) ->
     for field, value in data.items():
         setattr(novel, field, value)
     db.add(novel)
-    db.commit()
-    db.refresh(novel)
+    db.flush()
+    if "user_id" in data:
+        db.expire(novel, ["user"])
     return novel
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from ..config import get_settings
+
+_KEY_FIELDS = ("model", "messages", "temperature", "top_p", "max_tokens")
+
+
+def cache_key(payload: dict[str, Any]) -> str:
+    canonical = json.dumps(
+        {field: payload.get(field) for field in _KEY_FIELDS},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, disk_dir: str | None = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _is_fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl_seconds
+
+    def _remember(self, key: str, stored_at: float, value: dict[str, Any]) -> None:
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> tuple[float, dict[str, Any]] | None:
+        try:
+            with open(self._disk_path(key), encoding="utf-8") as fh:
+                record = json.load(fh)
+            return float(record["stored_at"]), record["response"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _write_disk(self, key: str, stored_at: float, value: dict[str, Any]) -> None:
+        path = self._disk_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            json.dump({"stored_at": stored_at, "response": value}, fh, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._is_fresh(entry[0]):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        if self.disk_dir is not None:
+            record = await asyncio.to_thread(self._read_disk, key)
+            if record is not None and self._is_fresh(record[0]):
+                self._remember(key, record[0], record[1])
+                self.disk_hits += 1
+                return record[1]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict[str, Any]) -> None:
+        stored_at = time.time()
+        self._remember(key, stored_at, value)
+        self.stores += 1
+        if self.disk_dir is not None:
+            try:
+                await asyncio.to_thread(self._write_disk, key, stored_at, value)
+            except OSError:
+                pass
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "enabled": True,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "disk_enabled": self.disk_dir is not None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+_response_cache: ResponseCache | None = None
+
+
+def get_response_cache() -> ResponseCache | None:
+    global _response_cache
+    settings = get_settings()
+    if not settings.ai_cache_enabled:
+        return None
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            max_entries=settings.ai_cache_max_entries,
+            ttl_seconds=settings.ai_cache_ttl_seconds,
+            disk_dir=settings.ai_cache_dir,
+        )
+    return _response_cache
@@ -1,10 +1,15 @@
 from __future__ import annotations
 
-from typing import Any
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable
 
 import httpx
 
 from ..config import get_settings
+from ..utils.metrics import DOUBAO_SECONDS, DOUBAO_TOKENS
+from .ai_cache import cache_key, get_response_cache
 
 WRITING_SYSTEM_PROMPT = """你是一位专业的中文小说作家。请严格遵循以下写作要求：
 
@@ -53,30 +58,207 @@ WRITING_SYSTEM_PROMPT = """你是一位专业的中文小说作家。请严格
 请严格按照以上要求创作，让文本更加自然、生动，符合人类的写作习惯。"""
 
 
+_http_client: httpx.AsyncClient | None = None
+
+
+def _build_http_client() -> httpx.AsyncClient:
+    settings = get_settings()
+    return httpx.AsyncClient(
+        http2=settings.doubao_http2,
+        timeout=httpx.Timeout(settings.doubao_timeout_seconds, connect=settings.doubao_connect_timeout_seconds),
+        limits=httpx.Limits(
+            max_connections=settings.doubao_max_connections,
+            max_keepalive_connections=settings.doubao_max_keepalive_connections,
+            keepalive_expiry=settings.doubao_keepalive_expiry_seconds,
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = _build_http_client()
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+class _Flight:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+_inflight: dict[str, _Flight] = {}
+
+
+async def _single_flight(key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+    flight = _inflight.get(key)
+    if flight is None:
+        flight = _Flight(asyncio.create_task(factory()))
+        _inflight[key] = flight
+
+        def _forget(_task: asyncio.Task, flight: _Flight = flight) -> None:
+            if _inflight.get(key) is flight:
+                del _inflight[key]
+
+        flight.task.add_done_callback(_forget)
+
+    flight.waiters += 1
+    try:
+        return await asyncio.shield(flight.task)
+    except asyncio.CancelledError:
+        # Only the last waiter to leave cancels the shared upstream call.
+        if flight.waiters == 1 and not flight.task.done():
+            flight.task.cancel()
+            if _inflight.get(key) is flight:
+                del _inflight[key]
+        raise
+    finally:
+        flight.waiters -= 1
+
+
+def ensure_doubao_configured() -> None:
+    if not get_settings().doubao_api_key:
+        raise ValueError("DOUBAO_API_KEY is not configured.")
+
+
+def _build_payload(
+    messages: list[dict[str, str]],
+    *,
+    temperature: float,
+    max_tokens: int,
+    top_p: float,
+) -> dict[str, Any]:
+    return {
+        "model": get_settings().doubao_model,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "top_p": top_p,
+    }
+
+
+def _auth_headers() -> dict[str, str]:
+    return {"Authorization": f"Bearer {get_settings().doubao_api_key}"}
+
+
+async def lookup_cached_chat(
+    messages: list[dict[str, str]],
+    *,
+    temperature: float,
+    max_tokens: int,
+    top_p: float,
+) -> dict[str, Any] | None:
+    cache = get_response_cache()
+    if cache is None:
+        return None
+    payload = _build_payload(messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p)
+    return await cache.get(cache_key(payload))
+
+
+async def store_cached_chat(
+    messages: list[dict[str, str]],
+    response: dict[str, Any],
+    *,
+    temperature: float,
+    max_tokens: int,
+    top_p: float,
+) -> None:
+    cache = get_response_cache()
+    if cache is None:
+        return
+    payload = _build_payload(messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p)
+    await cache.set(cache_key(payload), response)
+
+
+def _record_usage(usage: dict[str, Any] | None) -> None:
+    if not isinstance(usage, dict):
+        return
+    for kind in ("prompt_tokens", "completion_tokens", "total_tokens"):
+        value = usage.get(kind)
+        if isinstance(value, int):
+            DOUBAO_TOKENS.labels(kind.removesuffix("_tokens")).observe(value)
+
+
 async def doubao_chat(
     messages: list[dict[str, str]],
     *,
     temperature: float = 0.7,
     max_tokens: int = 2000,
     top_p: float = 0.9,
+    use_cache: bool = False,
+    refresh_cache: bool = False,
+    no_store: bool = False,
 ) -> dict[str, Any]:
+    ensure_doubao_configured()
     settings = get_settings()
-    if not settings.doubao_api_key:
-        raise ValueError("DOUBAO_API_KEY is not configured.")
+    payload = _build_payload(messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p)
 
-    payload = {
-        "model": settings.doubao_model,
-        "messages": messages,
-        "temperature": temperature,
-        "max_tokens": max_tokens,
-        "top_p": top_p,
-    }
+    key = cache_key(payload)
+    cache = get_response_cache() if use_cache else None
+    if cache is not None and not refresh_cache:
+        cached = await cache.get(key)
+        if cached is not None:
+            return cached
 
-    headers = {"Authorization": f"Bearer {settings.doubao_api_key}"}
-    async with httpx.AsyncClient(timeout=60) as client:
-        resp = await client.post(settings.doubao_api_url, json=payload, headers=headers)
+    async def fetch() -> dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            resp = await get_http_client().post(settings.doubao_api_url, json=payload, headers=_auth_headers())
+        finally:
+            DOUBAO_SECONDS.labels("chat").observe(time.perf_counter() - start)
         resp.raise_for_status()
-        return resp.json()
+        data = resp.json()
+        _record_usage(data.get("usage"))
+        if cache is not None and not no_store and data.get("choices"):
+            await cache.set(key, data)
+        return data
+
+    return await _single_flight(key, fetch)
+
+
+async def doubao_chat_stream(
+    messages: list[dict[str, str]],
+    *,
+    temperature: float = 0.7,
+    max_tokens: int = 2000,
+    top_p: float = 0.9,
+) -> AsyncIterator[str]:
+    ensure_doubao_configured()
+    settings = get_settings()
+    payload = _build_payload(messages, temperature=temperature, max_tokens=max_tokens, top_p=top_p)
+    payload["stream"] = True
+    payload["stream_options"] = {"include_usage": True}
+
+    start = time.perf_counter()
+    try:
+        async with get_http_client().stream(
+            "POST", settings.doubao_api_url, json=payload, headers=_auth_headers()
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                if not data:
+                    continue
+                chunk = json.loads(data)
+                _record_usage(chunk.get("usage"))
+                for choice in chunk.get("choices") or []:
+                    delta = (choice or {}).get("delta") or {}
+                    content = delta.get("content")
+                    if isinstance(content, str) and content:
+                        yield content
+    finally:
+        DOUBAO_SECONDS.labels("stream").observe(time.perf_counter() - start)
 
 
 def extract_content(doubao_response: dict[str, Any]) -> str:
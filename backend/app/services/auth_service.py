@@ -1,36 +1,51 @@
 from typing import Optional
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..models import User
 from ..schemas import UserCreate
-from ..utils.security import get_password_hash, verify_password, generate_uuid
+from ..utils.password_hasher import PasswordHasherBusy, check_password, hash_password, needs_rehash
+from ..utils.security import generate_uuid
 
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 
-def create_user(db: Session, user_in: UserCreate) -> User:
+def create_user(db: Session, user_in: UserCreate, password_hash: str) -> User:
     user = User(
         id=generate_uuid(),
         email=user_in.email,
         name=user_in.name,
         avatar=user_in.avatar,
-        password=get_password_hash(user_in.password),
+        password=password_hash,
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    db.flush()
     return user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-    user = get_user_by_email(db, email)
+def set_user_password(db: Session, user: User, password_hash: str) -> None:
+    user.password = password_hash
+    db.add(user)
+    db.flush()
+
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
+    user = await db.run_sync(get_user_by_email, email)
     if not user:
         return None
     if user.is_banned:
         return None
-    if not verify_password(password, user.password):
+    # Release the connection while bcrypt runs in the process pool.
+    await db.commit()
+    if not await check_password(password, user.password):
         return None
+    if needs_rehash(user.password):
+        try:
+            password_hash = await hash_password(password)
+        except PasswordHasherBusy:
+            return user
+        await db.run_sync(set_user_password, user, password_hash)
     return user
@@ -1,31 +1,172 @@
-from typing import List, Optional
+import asyncio
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy import LargeBinary, case, func, insert, select, type_coerce, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, load_only, undefer
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.exc import StaleDataError
 
-from ..models import Chapter, Novel
-from ..schemas import ChapterCreate, ChapterUpdate
+from ..models import Chapter, ChapterRevision, Novel
+from ..schemas import ChapterCreate, ChapterPatch, ChapterTextOp, ChapterUpdate
+from ..utils.compression import compress_text, is_compressed
+from ..utils.pagination import Page, paginate
 from ..utils.security import generate_uuid
+from .revision_service import KEYFRAME, record_revision, revision_content
+from .search_service import defer_reindex
+
+
+_VERSIONED_FIELDS = ("title", "content", "summary")
+ORDER_GAP = 1024
+
+
+class ChapterVersionConflict(Exception):
+    def __init__(self, current_version: int | None = None):
+        message = "Chapter has been modified"
+        if current_version is not None:
+            message += f" (current version {current_version})"
+        super().__init__(message)
+        self.current_version = current_version
 
 
 def _count_content_units(content: str) -> int:
     return len("".join(content.split()))
 
 
-def _recalculate_novel_stats(db: Session, novel: Novel) -> None:
-    chapter_count = db.query(func.count(Chapter.id)).filter(Chapter.novel_id == novel.id).scalar() or 0
-    word_count = db.query(func.coalesce(func.sum(Chapter.word_count), 0)).filter(Chapter.novel_id == novel.id).scalar() or 0
-    novel.chapter_count = int(chapter_count)
-    novel.word_count = int(word_count)
-    db.add(novel)
+def _apply_text_ops(content: str, ops: list[ChapterTextOp]) -> tuple[str, int]:
+    pieces = []
+    position = 0
+    word_delta = 0
+    for op in sorted(ops, key=lambda op: op.start):
+        if op.start < position or op.end < op.start or op.end > len(content):
+            raise ValueError("Invalid patch range")
+        pieces.append(content[position : op.start])
+        pieces.append(op.text)
+        word_delta += _count_content_units(op.text) - _count_content_units(content[op.start : op.end])
+        position = op.end
+    pieces.append(content[position:])
+    return "".join(pieces), word_delta
+
+
+def _flush_versioned(db: Session, chapter: Chapter) -> None:
+    try:
+        db.flush()
+    except StaleDataError:
+        raise ChapterVersionConflict()
+
+
+def _apply_novel_stats_delta(db: Session, novel: Novel, *, word_delta: int = 0, chapter_delta: int = 0) -> None:
+    if not word_delta and not chapter_delta:
+        return
+    db.query(Novel).filter(Novel.id == novel.id).update(
+        {
+            Novel.word_count: func.coalesce(Novel.word_count, 0) + word_delta,
+            Novel.chapter_count: func.coalesce(Novel.chapter_count, 0) + chapter_delta,
+        },
+        synchronize_session=False,
+    )
+    set_committed_value(novel, "word_count", (novel.word_count or 0) + word_delta)
+    set_committed_value(novel, "chapter_count", (novel.chapter_count or 0) + chapter_delta)
+
+
+def reconcile_novel_stats(db: Session, novel_id: str | None = None, batch_size: int = 500) -> int:
+    chapter_totals = select(func.count(Chapter.id)).where(Chapter.novel_id == Novel.id).scalar_subquery()
+    word_totals = (
+        select(func.coalesce(func.sum(Chapter.word_count), 0)).where(Chapter.novel_id == Novel.id).scalar_subquery()
+    )
+
+    repaired = 0
+    last_id = ""
+    while True:
+        ids_query = db.query(Novel.id).filter(Novel.id > last_id)
+        if novel_id:
+            ids_query = ids_query.filter(Novel.id == novel_id)
+        ids = [row[0] for row in ids_query.order_by(Novel.id.asc()).limit(batch_size).all()]
+        if not ids:
+            break
+
+        repaired += (
+            db.query(Novel)
+            .filter(
+                Novel.id.in_(ids),
+                (func.coalesce(Novel.chapter_count, -1) != chapter_totals)
+                | (func.coalesce(Novel.word_count, -1) != word_totals),
+            )
+            .update(
+                {
+                    Novel.chapter_count: chapter_totals,
+                    Novel.word_count: word_totals,
+                    Novel.updated_at: Novel.updated_at,
+                },
+                synchronize_session=False,
+            )
+        )
+        db.commit()
+        last_id = ids[-1]
 
+    return repaired
 
-def list_chapters(db: Session, user_id: str, novel_id: str) -> List[Chapter]:
+
+def compress_chapter_contents(db: Session, batch_size: int = 200) -> int:
+    table = Chapter.__table__
+    raw_content = type_coerce(table.c.content, LargeBinary)
+    compressed = 0
+    last_id = ""
+    while True:
+        rows = db.execute(
+            select(table.c.id, table.c.version, raw_content)
+            .where(table.c.id > last_id)
+            .order_by(table.c.id.asc())
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        for chapter_id, version, content in rows:
+            if content is not None and not is_compressed(bytes(content)):
+                # Every content edit bumps the version, so a save that lands
+                # between the read and this write makes the update a no-op
+                # instead of reverting it.
+                result = db.execute(
+                    update(table)
+                    .where(table.c.id == chapter_id, table.c.version == version)
+                    .values(content=bytes(content).decode("utf-8"), updated_at=table.c.updated_at)
+                )
+                compressed += result.rowcount
+        db.commit()
+        last_id = rows[-1][0]
+    return compressed
+
+
+def list_chapters(
+    db: Session, user_id: str, novel_id: str, limit: int | None = None, cursor: str | None = None
+) -> Page:
+    query = (
+        db.query(Chapter)
+        .options(undefer(Chapter.content))
+        .join(Novel, Novel.id == Chapter.novel_id)
+        .filter(Chapter.novel_id == novel_id, Novel.user_id == user_id, Novel.is_banned == False)
+    )
+    return paginate(query, [(Chapter.order, False), (Chapter.created_at, False), (Chapter.id, False)], limit, cursor)
+
+
+def list_chapter_index(db: Session, user_id: str, novel_id: str) -> List[Chapter]:
     return (
         db.query(Chapter)
+        .options(
+            load_only(
+                Chapter.id,
+                Chapter.title,
+                Chapter.order,
+                Chapter.word_count,
+                Chapter.status,
+                Chapter.updated_at,
+                raiseload=True,
+            )
+        )
         .join(Novel, Novel.id == Chapter.novel_id)
         .filter(Chapter.novel_id == novel_id, Novel.user_id == user_id, Novel.is_banned == False)
-        .order_by(Chapter.order.asc(), Chapter.created_at.asc())
+        .order_by(Chapter.order.asc(), Chapter.created_at.asc(), Chapter.id.asc())
         .all()
     )
 
@@ -33,19 +174,46 @@ def list_chapters(db: Session, user_id: str, novel_id: str) -> List[Chapter]:
 def get_chapter(db: Session, user_id: str, chapter_id: str) -> Optional[Chapter]:
     return (
         db.query(Chapter)
+        .options(undefer(Chapter.content))
         .join(Novel, Novel.id == Chapter.novel_id)
         .filter(Chapter.id == chapter_id, Novel.user_id == user_id, Novel.is_banned == False)
         .first()
     )
 
 
+def get_chapter_for_move(db: Session, user_id: str, novel_id: str, chapter_id: str) -> Optional[Chapter]:
+    return (
+        db.query(Chapter)
+        .options(
+            load_only(
+                Chapter.id,
+                Chapter.novel_id,
+                Chapter.title,
+                Chapter.order,
+                Chapter.word_count,
+                Chapter.status,
+                Chapter.updated_at,
+                raiseload=True,
+            )
+        )
+        .join(Novel, Novel.id == Chapter.novel_id)
+        .filter(
+            Chapter.id == chapter_id,
+            Chapter.novel_id == novel_id,
+            Novel.user_id == user_id,
+            Novel.is_banned == False,
+        )
+        .first()
+    )
+
+
 def create_chapter(db: Session, user_id: str, novel: Novel, chapter_in: ChapterCreate) -> Chapter:
     if novel.user_id != user_id:
         raise ValueError("Forbidden")
 
     if not chapter_in.order or chapter_in.order <= 0:
         max_order = db.query(func.coalesce(func.max(Chapter.order), 0)).filter(Chapter.novel_id == novel.id).scalar() or 0
-        order_value = int(max_order) + 1
+        order_value = int(max_order) + ORDER_GAP
     else:
         order_value = int(chapter_in.order)
 
@@ -60,41 +228,165 @@ def create_chapter(db: Session, user_id: str, novel: Novel, chapter_in: ChapterC
         word_count=_count_content_units(chapter_in.content),
     )
     db.add(chapter)
-    db.commit()
-    db.refresh(chapter)
-
-    _recalculate_novel_stats(db, novel)
-    db.commit()
-    db.refresh(novel)
+    _apply_novel_stats_delta(db, novel, word_delta=chapter.word_count, chapter_delta=1)
+    db.flush()
+    record_revision(db, chapter)
 
     return chapter
 
 
+def _last_chapter_order(db: Session, novel_id: str) -> int:
+    return db.query(func.coalesce(func.max(Chapter.order), 0)).filter(Chapter.novel_id == novel_id).scalar() or 0
+
+
+def _chapter_import_batches(
+    novel_id: str, chapters: Iterable[tuple[str, str]], order_value: int, batch_size: int
+) -> Iterator[tuple[list[dict], list[dict]]]:
+    now = datetime.utcnow()
+    chapter_rows: list[dict] = []
+    revision_rows: list[dict] = []
+    for title, content in chapters:
+        order_value += ORDER_GAP
+        chapter_id = generate_uuid()
+        word_count = _count_content_units(content)
+        chapter_rows.append(
+            {
+                "id": chapter_id,
+                "novel_id": novel_id,
+                "title": title,
+                "content": content,
+                "order": order_value,
+                "status": "draft",
+                "word_count": word_count,
+                "version": 1,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        revision_rows.append(
+            {
+                "id": generate_uuid(),
+                "chapter_id": chapter_id,
+                "number": 1,
+                "kind": KEYFRAME,
+                "base_number": 1,
+                "payload": compress_text(content),
+                "title": title,
+                "word_count": word_count,
+                "chapter_version": 1,
+                "created_at": now,
+                "updated_at": now,
+            }
+        )
+        if len(chapter_rows) >= batch_size:
+            yield chapter_rows, revision_rows
+            chapter_rows, revision_rows = [], []
+    if chapter_rows:
+        yield chapter_rows, revision_rows
+
+
+def _insert_chapter_batch(db: Session, chapter_rows: list[dict], revision_rows: list[dict]) -> None:
+    db.execute(insert(Chapter), chapter_rows)
+    db.execute(insert(ChapterRevision), revision_rows)
+    defer_reindex(db, {("chapter", row["id"]) for row in chapter_rows})
+
+
+async def bulk_create_chapters(
+    db: AsyncSession, novel: Novel, chapters: Iterable[tuple[str, str]], batch_size: int = 200
+) -> tuple[int, int]:
+    order_value = await db.run_sync(_last_chapter_order, novel.id)
+    batches = _chapter_import_batches(novel.id, chapters, order_value, batch_size)
+    created = words = 0
+    # Decoding and splitting the manuscript is CPU-bound, so the batches are
+    # built in a worker thread and only the inserts run on the event loop.
+    while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+        chapter_rows, revision_rows = batch
+        await db.run_sync(_insert_chapter_batch, chapter_rows, revision_rows)
+        created += len(chapter_rows)
+        words += sum(row["word_count"] for row in chapter_rows)
+    await db.run_sync(_apply_novel_stats_delta, novel, word_delta=words, chapter_delta=created)
+    return created, words
+
+
 def update_chapter(db: Session, novel: Novel, chapter: Chapter, chapter_in: ChapterUpdate) -> Chapter:
     payload = chapter_in.model_dump(exclude_unset=True)
+    base_version = payload.pop("base_version", None)
+    if base_version is not None and base_version != chapter.version:
+        raise ChapterVersionConflict(chapter.version)
+
+    previous_word_count = chapter.word_count or 0
     for field, value in payload.items():
         setattr(chapter, field, value)
     if "content" in payload and payload["content"] is not None:
         chapter.word_count = _count_content_units(payload["content"])
+    if any(field in payload for field in _VERSIONED_FIELDS):
+        chapter.version = (chapter.version or 1) + 1
 
     db.add(chapter)
-    db.commit()
-    db.refresh(chapter)
+    _apply_novel_stats_delta(db, novel, word_delta=(chapter.word_count or 0) - previous_word_count)
+    _flush_versioned(db, chapter)
+    if "content" in payload or "title" in payload:
+        record_revision(db, chapter)
+
+    return chapter
+
+
+def patch_chapter(db: Session, novel: Novel, chapter: Chapter, patch: ChapterPatch) -> Chapter:
+    if patch.base_version != chapter.version:
+        raise ChapterVersionConflict(chapter.version)
 
-    _recalculate_novel_stats(db, novel)
-    db.commit()
-    db.refresh(novel)
+    word_delta = 0
+    if patch.ops:
+        chapter.content, word_delta = _apply_text_ops(chapter.content or "", patch.ops)
+        chapter.word_count = (chapter.word_count or 0) + word_delta
+    fields = patch.model_dump(exclude_unset=True, include={"title", "summary", "status"})
+    for field, value in fields.items():
+        setattr(chapter, field, value)
+    if patch.ops or any(field in fields for field in _VERSIONED_FIELDS):
+        chapter.version = patch.base_version + 1
+
+    db.add(chapter)
+    _apply_novel_stats_delta(db, novel, word_delta=word_delta)
+    _flush_versioned(db, chapter)
+    if patch.ops or patch.title is not None:
+        record_revision(db, chapter)
 
     return chapter
 
 
+def restore_chapter_revision(
+    db: Session, novel: Novel, chapter: Chapter, revision: ChapterRevision, base_version: Optional[int] = None
+) -> Chapter:
+    content = revision_content(db, revision)
+    return update_chapter(
+        db, novel, chapter, ChapterUpdate(title=revision.title, content=content, base_version=base_version)
+    )
+
+
 def delete_chapter(db: Session, novel: Novel, chapter: Chapter) -> None:
     db.delete(chapter)
-    db.commit()
+    _apply_novel_stats_delta(db, novel, word_delta=-(chapter.word_count or 0), chapter_delta=-1)
+    db.flush()
+
+
+def _write_chapter_orders(db: Session, novel_id: str, orders: dict[str, int]) -> None:
+    db.execute(
+        update(Chapter)
+        .where(Chapter.novel_id == novel_id, Chapter.id.in_(list(orders)))
+        .values(order=case(orders, value=Chapter.id))
+        .execution_options(synchronize_session=False)
+    )
 
-    _recalculate_novel_stats(db, novel)
-    db.commit()
-    db.refresh(novel)
+
+def rebalance_chapter_order(db: Session, novel_id: str) -> None:
+    ids = [
+        row[0]
+        for row in db.query(Chapter.id)
+        .filter(Chapter.novel_id == novel_id)
+        .order_by(Chapter.order.asc(), Chapter.created_at.asc(), Chapter.id.asc())
+    ]
+    if ids:
+        _write_chapter_orders(db, novel_id, {cid: idx * ORDER_GAP for idx, cid in enumerate(ids, start=1)})
 
 
 def reorder_chapters(db: Session, user_id: str, novel: Novel, chapter_ids: list[str]) -> None:
@@ -105,19 +397,64 @@ def reorder_chapters(db: Session, user_id: str, novel: Novel, chapter_ids: list[
     if not clean_ids:
         raise ValueError("chapter_ids 不能为空")
 
-    rows = (
-        db.query(Chapter)
-        .join(Novel, Novel.id == Chapter.novel_id)
-        .filter(Chapter.novel_id == novel.id, Novel.user_id == user_id, Chapter.id.in_(clean_ids))
-        .all()
+    found = (
+        db.query(func.count(Chapter.id))
+        .filter(Chapter.novel_id == novel.id, Chapter.id.in_(set(clean_ids)))
+        .scalar()
     )
-
-    by_id = {c.id: c for c in rows}
-    if len(by_id) != len(set(clean_ids)):
+    if found != len(set(clean_ids)):
         raise ValueError("chapter_ids 包含不存在或不属于当前作品的章节")
 
-    for idx, cid in enumerate(clean_ids, start=1):
-        by_id[cid].order = idx
-        db.add(by_id[cid])
+    _write_chapter_orders(db, novel.id, {cid: idx * ORDER_GAP for idx, cid in enumerate(clean_ids, start=1)})
+
+
+def _sibling_order(db: Session, chapter: Chapter, anchor: Chapter, after: bool) -> Optional[int]:
+    query = db.query(func.min(Chapter.order) if after else func.max(Chapter.order)).filter(
+        Chapter.novel_id == anchor.novel_id,
+        Chapter.id.notin_([chapter.id, anchor.id]),
+        Chapter.order >= anchor.order if after else Chapter.order <= anchor.order,
+    )
+    return query.scalar()
+
 
-    db.commit()
+def _move_target(db: Session, chapter: Chapter, anchor: Chapter, after: bool) -> Optional[int]:
+    sibling = _sibling_order(db, chapter, anchor, after)
+    if sibling is None:
+        if after:
+            return anchor.order + ORDER_GAP
+        # Split the gap down to zero rather than going negative; once it is used
+        # up the caller rebalances, so orders always stay positive.
+        sibling = 0
+    low, high = (anchor.order, sibling) if after else (sibling, anchor.order)
+    if high - low < 2:
+        return None
+    return (low + high) // 2
+
+
+def move_chapter(
+    db: Session, novel: Novel, chapter: Chapter, before_id: Optional[str] = None, after_id: Optional[str] = None
+) -> Chapter:
+    if (before_id is None) == (after_id is None):
+        raise ValueError("Specify exactly one of before_id or after_id")
+    anchor_id = after_id or before_id
+    if anchor_id == chapter.id:
+        raise ValueError("Cannot move a chapter relative to itself")
+    anchor = (
+        db.query(Chapter)
+        .options(load_only(Chapter.id, Chapter.novel_id, Chapter.order, raiseload=True))
+        .filter(Chapter.id == anchor_id, Chapter.novel_id == novel.id)
+        .first()
+    )
+    if anchor is None:
+        raise ValueError("Sibling chapter not found")
+
+    after = after_id is not None
+    target = _move_target(db, chapter, anchor, after)
+    if target is None:
+        rebalance_chapter_order(db, novel.id)
+        db.refresh(anchor, ["order"])
+        target = _move_target(db, chapter, anchor, after)
+
+    db.query(Chapter).filter(Chapter.id == chapter.id).update({Chapter.order: target}, synchronize_session=False)
+    db.refresh(chapter, ["order", "updated_at"])
+    return chapter
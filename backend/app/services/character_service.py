@@ -1,20 +1,22 @@
-from typing import List, Optional
+from typing import Optional
 
 from sqlalchemy.orm import Session
 
 from ..models import Character, Novel
 from ..schemas import CharacterCreate, CharacterUpdate
+from ..utils.pagination import Page, paginate
 from ..utils.security import generate_uuid
 
 
-def list_characters(db: Session, user_id: str, novel_id: str) -> List[Character]:
-    return (
+def list_characters(
+    db: Session, user_id: str, novel_id: str, limit: int | None = None, cursor: str | None = None
+) -> Page:
+    query = (
         db.query(Character)
         .join(Novel, Novel.id == Character.novel_id)
         .filter(Character.novel_id == novel_id, Novel.user_id == user_id, Novel.is_banned == False)
-        .order_by(Character.created_at.desc())
-        .all()
     )
+    return paginate(query, [(Character.created_at, True), (Character.id, True)], limit, cursor)
 
 
 def get_character(db: Session, user_id: str, character_id: str) -> Optional[Character]:
@@ -41,8 +43,7 @@ def create_character(db: Session, user_id: str, novel: Novel, character_in: Char
         relationships=character_in.relationships,
     )
     db.add(character)
-    db.commit()
-    db.refresh(character)
+    db.flush()
     return character
 
 
@@ -50,12 +51,11 @@ def update_character(db: Session, character: Character, character_in: CharacterU
     for field, value in character_in.model_dump(exclude_unset=True).items():
         setattr(character, field, value)
     db.add(character)
-    db.commit()
-    db.refresh(character)
+    db.flush()
     return character
 
 
 def delete_character(db: Session, character: Character) -> None:
     db.delete(character)
-    db.commit()
+    db.flush()
 
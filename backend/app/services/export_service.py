@@ -0,0 +1,172 @@
+import io
+import re
+import zipfile
+from datetime import datetime
+from html import escape
+from typing import AsyncIterator, Callable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models import Chapter
+
+EXPORT_FORMATS = {
+    "txt": ("text/plain; charset=utf-8", "txt"),
+    "md": ("text/markdown; charset=utf-8", "md"),
+    "epub": ("application/epub+zip", "epub"),
+}
+_YIELD_PER = 50
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+async def _chapter_texts(db: AsyncSession, novel_id: str) -> AsyncIterator[tuple[str, str]]:
+    result = await db.stream(
+        select(Chapter.title, Chapter.content)
+        .where(Chapter.novel_id == novel_id)
+        .order_by(Chapter.order.asc(), Chapter.created_at.asc(), Chapter.id.asc())
+        .execution_options(yield_per=_YIELD_PER)
+    )
+    async for title, content in result:
+        yield title, content or ""
+
+
+async def _export_txt(chapters, title: str, description: str | None) -> AsyncIterator[bytes]:
+    header = f"{title}\n\n{description}\n\n" if description else f"{title}\n\n"
+    yield header.encode("utf-8")
+    async for chapter_title, content in chapters:
+        yield f"{chapter_title}\n\n{content}\n\n".encode("utf-8")
+
+
+def _markdown_paragraphs(content: str) -> str:
+    return "\n\n".join(line.strip(" \t") for line in content.splitlines() if line.strip())
+
+
+async def _export_md(chapters, title: str, description: str | None) -> AsyncIterator[bytes]:
+    header = f"# {title}\n\n"
+    if description:
+        header += "".join(f"> {line}\n" for line in description.splitlines()) + "\n"
+    yield header.encode("utf-8")
+    async for chapter_title, content in chapters:
+        yield f"## {chapter_title}\n\n{_markdown_paragraphs(content)}\n\n".encode("utf-8")
+
+
+class _ChunkSink:
+    # Seekable only within the bytes not yet drained. That is enough for zipfile
+    # to patch each local header with the real CRC and size, so no member (the
+    # stored mimetype in particular) needs a trailing data descriptor.
+    def __init__(self):
+        self._buffer = io.BytesIO()
+        self._drained = 0
+
+    def write(self, data: bytes) -> int:
+        return self._buffer.write(data)
+
+    def tell(self) -> int:
+        return self._drained + self._buffer.tell()
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence != io.SEEK_SET or offset < self._drained:
+            raise io.UnsupportedOperation("Cannot seek into data that was already sent")
+        return self._drained + self._buffer.seek(offset - self._drained)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = self._buffer.getvalue()
+        self._drained += len(data)
+        self._buffer = io.BytesIO()
+        return data
+
+
+def _xml_text(text: str) -> str:
+    return escape(_XML_INVALID.sub("", text), quote=False)
+
+
+def _xml_attr(text: str) -> str:
+    return escape(_XML_INVALID.sub("", text))
+
+
+def _xhtml(title: str, body: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE html>\n'
+        '<html xmlns="http://www.w3.org/1999/xhtml" xmlns:epub="http://www.idpf.org/2007/ops" lang="zh-CN">\n'
+        f"<head><meta charset=\"utf-8\"/><title>{_xml_text(title)}</title></head>\n<body>\n{body}</body>\n</html>\n"
+    )
+
+
+def _chapter_xhtml(title: str, content: str) -> str:
+    paragraphs = "".join(f"<p>{_xml_text(line)}</p>\n" for line in content.splitlines() if line.strip())
+    return _xhtml(title, f"<h2>{_xml_text(title)}</h2>\n{paragraphs}")
+
+
+_CONTAINER_XML = (
+    '<?xml version="1.0" encoding="utf-8"?>\n'
+    '<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">\n'
+    '<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles>\n'
+    "</container>\n"
+)
+
+
+def _package_opf(novel_id: str, title: str, description: str | None, count: int) -> str:
+    modified = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+    items = "".join(
+        f'<item id="c{i}" href="chapter-{i:05d}.xhtml" media-type="application/xhtml+xml"/>\n'
+        for i in range(1, count + 1)
+    )
+    spine = "".join(f'<itemref idref="c{i}"/>\n' for i in range(1, count + 1))
+    summary = f"<dc:description>{_xml_text(description)}</dc:description>\n" if description else ""
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<package xmlns="http://www.idpf.org/2007/opf" version="3.0" unique-identifier="book-id">\n'
+        '<metadata xmlns:dc="http://purl.org/dc/elements/1.1/">\n'
+        f'<dc:identifier id="book-id">urn:uuid:{_xml_text(novel_id)}</dc:identifier>\n'
+        f"<dc:title>{_xml_text(title)}</dc:title>\n<dc:language>zh-CN</dc:language>\n{summary}"
+        f'<meta property="dcterms:modified">{modified}</meta>\n</metadata>\n'
+        '<manifest>\n<item id="nav" href="nav.xhtml" media-type="application/xhtml+xml" properties="nav"/>\n'
+        f"{items}</manifest>\n<spine>\n{spine}</spine>\n</package>\n"
+    )
+
+
+def _nav_xhtml(title: str, titles: list[str]) -> str:
+    links = "".join(
+        f'<li><a href="chapter-{i:05d}.xhtml">{_xml_text(chapter_title)}</a></li>\n'
+        for i, chapter_title in enumerate(titles, start=1)
+    )
+    return _xhtml(title, f'<nav epub:type="toc" id="toc"><h1>{_xml_text(title)}</h1>\n<ol>\n{links}</ol></nav>\n')
+
+
+async def _export_epub(chapters, title: str, description: str | None, novel_id: str) -> AsyncIterator[bytes]:
+    sink = _ChunkSink()
+    archive = zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED)
+    archive.writestr(zipfile.ZipInfo("mimetype"), "application/epub+zip", compress_type=zipfile.ZIP_STORED)
+    archive.writestr("META-INF/container.xml", _CONTAINER_XML)
+    titles: list[str] = []
+    async for chapter_title, content in chapters:
+        titles.append(chapter_title)
+        archive.writestr(f"OEBPS/chapter-{len(titles):05d}.xhtml", _chapter_xhtml(chapter_title, content))
+        yield sink.drain()
+    archive.writestr("OEBPS/nav.xhtml", _nav_xhtml(title, titles))
+    archive.writestr("OEBPS/content.opf", _package_opf(novel_id, title, description, len(titles)))
+    archive.close()
+    yield sink.drain()
+
+
+async def export_novel(
+    session_factory: Callable[[], AsyncSession],
+    novel_id: str,
+    title: str,
+    description: str | None,
+    export_format: str,
+) -> AsyncIterator[bytes]:
+    async with session_factory() as db:
+        chapters = _chapter_texts(db, novel_id)
+        if export_format == "epub":
+            stream = _export_epub(chapters, title, description, novel_id)
+        elif export_format == "md":
+            stream = _export_md(chapters, title, description)
+        else:
+            stream = _export_txt(chapters, title, description)
+        async for chunk in stream:
+            if chunk:
+                yield chunk
@@ -0,0 +1,180 @@
+import codecs
+import io
+import posixpath
+import re
+import zipfile
+from html.parser import HTMLParser
+from pathlib import PurePath
+from typing import BinaryIO, Iterable, Iterator
+from urllib.parse import unquote
+from xml.etree import ElementTree
+
+_HEADING_MAX_LENGTH = 60
+_TITLE_MAX_LENGTH = 255
+_SNIFF_BYTES = 64 * 1024
+_CONTAINER_NS = "{urn:oasis:names:tc:opendocument:xmlns:container}"
+_OPF_NS = "{http://www.idpf.org/2007/opf}"
+
+
+def manuscript_format(filename: str | None, content_type: str | None) -> str:
+    suffix = PurePath(filename or "").suffix.lower()
+    if suffix == ".epub" or content_type == "application/epub+zip":
+        return "epub"
+    if suffix in (".txt", ".text") or content_type == "text/plain":
+        return "txt"
+    raise ValueError("Unsupported file type, expected .txt or .epub")
+
+
+def _sniff_encoding(file: BinaryIO) -> str:
+    head = file.read(_SNIFF_BYTES)
+    file.seek(0)
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "gb18030"
+
+
+def _txt_lines(file: BinaryIO, max_bytes: int) -> Iterator[tuple[str, bool]]:
+    reader = io.TextIOWrapper(file, encoding=_sniff_encoding(file), newline=None)
+    try:
+        for line in reader:
+            if file.tell() > max_bytes:
+                raise ValueError("Manuscript is too large")
+            yield line.rstrip("\n"), False
+    except UnicodeDecodeError:
+        raise ValueError("Could not decode manuscript text")
+    finally:
+        reader.detach()
+
+
+class _XHTMLText(HTMLParser):
+    _BLOCKS = {
+        "address", "article", "blockquote", "br", "dd", "div", "dt", "h1", "h2", "h3", "h4", "h5", "h6",
+        "hr", "li", "p", "pre", "section", "td", "tr",
+    }
+    _HEADINGS = {"h1", "h2", "h3"}
+    _SKIP = {"head", "script", "style"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: list[tuple[str, bool]] = []
+        self._buffer: list[str] = []
+        self._skip = 0
+        self._in_heading = False
+        self._seen_heading = False
+
+    def _flush(self) -> None:
+        text = " ".join("".join(self._buffer).split())
+        self._buffer = []
+        if not text:
+            return
+        is_heading = self._in_heading and not self._seen_heading
+        self._seen_heading = self._seen_heading or is_heading
+        self.lines.append((text, is_heading))
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skip += 1
+        elif tag in self._BLOCKS:
+            self._flush()
+            if tag in self._HEADINGS:
+                self._in_heading = True
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP:
+            self._skip = max(self._skip - 1, 0)
+        elif tag in self._BLOCKS:
+            self._flush()
+            if tag in self._HEADINGS:
+                self._in_heading = False
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._buffer.append(data)
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _epub_spine(archive: zipfile.ZipFile) -> list[str]:
+    container = ElementTree.fromstring(archive.read("META-INF/container.xml"))
+    rootfile = container.find(f".//{_CONTAINER_NS}rootfile")
+    if rootfile is None or not rootfile.get("full-path"):
+        raise ValueError("Invalid EPUB file")
+    opf_path = rootfile.get("full-path")
+    opf = ElementTree.fromstring(archive.read(opf_path))
+    manifest = {item.get("id"): item.get("href") for item in opf.iter(f"{_OPF_NS}item")}
+    base = posixpath.dirname(opf_path)
+    spine = []
+    for itemref in opf.iter(f"{_OPF_NS}itemref"):
+        href = manifest.get(itemref.get("idref"))
+        if href:
+            spine.append(posixpath.normpath(posixpath.join(base, unquote(href))))
+    return spine
+
+
+def _epub_lines(file: BinaryIO, max_bytes: int) -> Iterator[tuple[str, bool]]:
+    try:
+        archive = zipfile.ZipFile(file)
+        spine = _epub_spine(archive)
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+        raise ValueError("Invalid EPUB file")
+    remaining = max_bytes
+    for path in spine:
+        try:
+            member = archive.open(path)
+        except KeyError:
+            continue
+        with member:
+            data = member.read(remaining + 1)
+        if len(data) > remaining:
+            raise ValueError("Manuscript is too large")
+        remaining -= len(data)
+        parser = _XHTMLText()
+        parser.feed(data.decode("utf-8", errors="replace"))
+        parser.close()
+        yield from parser.lines
+
+
+def _chapter_text(lines: list[str]) -> str:
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    return "\n".join(lines[start:end])
+
+
+def split_chapters(
+    lines: Iterable[tuple[str, bool]], heading: re.Pattern, default_title: str
+) -> Iterator[tuple[str, str]]:
+    title = None
+    body: list[str] = []
+    for line, is_heading in lines:
+        stripped = line.strip()
+        if is_heading or (stripped and len(stripped) <= _HEADING_MAX_LENGTH and heading.match(stripped)):
+            content = _chapter_text(body)
+            if content:
+                yield title or default_title, content
+            title, body = stripped[:_TITLE_MAX_LENGTH], []
+        else:
+            body.append(line)
+    content = _chapter_text(body)
+    if content:
+        yield title or default_title, content
+
+
+def parse_manuscript(
+    file: BinaryIO,
+    filename: str | None,
+    content_type: str | None,
+    heading_pattern: str,
+    max_bytes: int,
+) -> Iterator[tuple[str, str]]:
+    reader = _epub_lines if manuscript_format(filename, content_type) == "epub" else _txt_lines
+    default_title = (PurePath(filename).stem if filename else "")[:_TITLE_MAX_LENGTH] or "正文"
+    return split_chapters(reader(file, max_bytes), re.compile(heading_pattern), default_title)
@@ -1,19 +1,16 @@
-from typing import List, Optional
+from typing import Optional
 
 from sqlalchemy.orm import Session
 
 from ..models import Novel
 from ..schemas import NovelCreate, NovelUpdate
+from ..utils.pagination import Page, paginate
 from ..utils.security import generate_uuid
 
 
-def list_novels(db: Session, user_id: str) -> List[Novel]:
-    return (
-        db.query(Novel)
-        .filter(Novel.user_id == user_id, Novel.is_banned == False)
-        .order_by(Novel.created_at.desc())
-        .all()
-    )
+def list_novels(db: Session, user_id: str, limit: int | None = None, cursor: str | None = None) -> Page:
+    query = db.query(Novel).filter(Novel.user_id == user_id, Novel.is_banned == False)
+    return paginate(query, [(Novel.created_at, True), (Novel.id, True)], limit, cursor)
 
 
 def create_novel(db: Session, user_id: str, novel_in: NovelCreate) -> Novel:
@@ -27,8 +24,7 @@ def create_novel(db: Session, user_id: str, novel_in: NovelCreate) -> Novel:
         tags=novel_in.tags,
     )
     db.add(novel)
-    db.commit()
-    db.refresh(novel)
+    db.flush()
     return novel
 
 
@@ -44,11 +40,10 @@ def update_novel(db: Session, novel: Novel, novel_in: NovelUpdate) -> Novel:
     for field, value in novel_in.model_dump(exclude_unset=True).items():
         setattr(novel, field, value)
     db.add(novel)
-    db.commit()
-    db.refresh(novel)
+    db.flush()
     return novel
 
 
 def delete_novel(db: Session, novel: Novel) -> None:
     db.delete(novel)
-    db.commit()
+    db.flush()
@@ -1,21 +1,23 @@
-from typing import List, Optional
+from typing import Optional
 
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from ..models import Outline, Novel
 from ..schemas import OutlineCreate, OutlineUpdate
+from ..utils.pagination import Page, paginate
 from ..utils.security import generate_uuid
 
 
-def list_outlines(db: Session, user_id: str, novel_id: str) -> List[Outline]:
-    return (
+def list_outlines(
+    db: Session, user_id: str, novel_id: str, limit: int | None = None, cursor: str | None = None
+) -> Page:
+    query = (
         db.query(Outline)
         .join(Novel, Novel.id == Outline.novel_id)
         .filter(Outline.novel_id == novel_id, Novel.user_id == user_id, Novel.is_banned == False)
-        .order_by(Outline.order.asc(), Outline.created_at.asc())
-        .all()
     )
+    return paginate(query, [(Outline.order, False), (Outline.created_at, False), (Outline.id, False)], limit, cursor)
 
 
 def get_outline(db: Session, user_id: str, outline_id: str) -> Optional[Outline]:
@@ -46,8 +48,7 @@ def create_outline(db: Session, user_id: str, novel: Novel, outline_in: OutlineC
         order=order_value,
     )
     db.add(outline)
-    db.commit()
-    db.refresh(outline)
+    db.flush()
     return outline
 
 
@@ -55,11 +56,10 @@ def update_outline(db: Session, outline: Outline, outline_in: OutlineUpdate) ->
     for field, value in outline_in.model_dump(exclude_unset=True).items():
         setattr(outline, field, value)
     db.add(outline)
-    db.commit()
-    db.refresh(outline)
+    db.flush()
     return outline
 
 
 def delete_outline(db: Session, outline: Outline) -> None:
     db.delete(outline)
-    db.commit()
+    db.flush()
@@ -0,0 +1,163 @@
+import difflib
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session, defer
+
+from ..config import get_settings
+from ..models import Chapter, ChapterRevision
+from ..utils.compression import compress_bytes, compress_text, decompress_bytes, decompress_text
+from ..utils.pagination import Page, paginate
+from ..utils.security import generate_uuid
+
+KEYFRAME = "keyframe"
+DELTA = "delta"
+
+
+def _encode_delta(base_text: str, text: str) -> bytes:
+    base_lines = base_text.splitlines(keepends=True)
+    lines = text.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, base_lines, lines, autojunk=False)
+    ops = [
+        [i1, i2, lines[j1:j2]]
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+    return compress_bytes(json.dumps(ops, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def _apply_delta(base_text: str, payload: bytes) -> str:
+    base_lines = base_text.splitlines(keepends=True)
+    pieces = []
+    position = 0
+    for i1, i2, lines in json.loads(decompress_bytes(payload)):
+        pieces.extend(base_lines[position:i1])
+        pieces.extend(lines)
+        position = i2
+    pieces.extend(base_lines[position:])
+    return "".join(pieces)
+
+
+def _latest_revision(db: Session, chapter_id: str) -> Optional[ChapterRevision]:
+    return (
+        db.query(ChapterRevision)
+        .filter(ChapterRevision.chapter_id == chapter_id)
+        .order_by(ChapterRevision.number.desc())
+        .first()
+    )
+
+
+def _keyframe_text(db: Session, chapter_id: str, number: int) -> str:
+    payload = (
+        db.query(ChapterRevision.payload)
+        .filter(ChapterRevision.chapter_id == chapter_id, ChapterRevision.number == number)
+        .scalar()
+    )
+    return decompress_text(payload)
+
+
+def _fill_revision(db: Session, revision: ChapterRevision, chapter: Chapter, base_number: Optional[int]) -> None:
+    settings = get_settings()
+    content = chapter.content or ""
+    full = compress_text(content)
+    revision.kind, revision.base_number, revision.payload = KEYFRAME, revision.number, full
+    if base_number is not None and revision.number - base_number < settings.chapter_revision_keyframe_interval:
+        delta = _encode_delta(_keyframe_text(db, chapter.id, base_number), content)
+        if len(delta) * 2 < len(full):
+            revision.kind, revision.base_number, revision.payload = DELTA, base_number, delta
+    revision.title = chapter.title
+    revision.word_count = chapter.word_count
+    revision.chapter_version = chapter.version or 1
+
+
+def _prune_revisions(db: Session, chapter_id: str, now: datetime) -> None:
+    settings = get_settings()
+    rows = (
+        db.query(ChapterRevision.number, ChapterRevision.base_number, ChapterRevision.created_at)
+        .filter(ChapterRevision.chapter_id == chapter_id)
+        .order_by(ChapterRevision.number.desc())
+        .all()
+    )
+    age_limit = (
+        now - timedelta(days=settings.chapter_revision_retention_days)
+        if settings.chapter_revision_retention_days
+        else None
+    )
+    kept = [
+        row
+        for index, row in enumerate(rows)
+        if index == 0
+        or (index < settings.chapter_revision_max_count and (age_limit is None or row.created_at >= age_limit))
+    ]
+    oldest_needed = min(row.base_number for row in kept)
+    if oldest_needed > rows[-1].number:
+        db.query(ChapterRevision).filter(
+            ChapterRevision.chapter_id == chapter_id, ChapterRevision.number < oldest_needed
+        ).delete(synchronize_session=False)
+
+
+def record_revision(db: Session, chapter: Chapter) -> ChapterRevision:
+    settings = get_settings()
+    now = datetime.utcnow()
+    latest = _latest_revision(db, chapter.id)
+    window = timedelta(seconds=settings.chapter_revision_coalesce_seconds)
+    if latest is not None and latest.created_at and now - latest.created_at < window:
+        base_number = latest.base_number if latest.kind == DELTA else None
+        _fill_revision(db, latest, chapter, base_number)
+        latest.updated_at = now
+        return latest
+
+    revision = ChapterRevision(
+        id=generate_uuid(),
+        chapter_id=chapter.id,
+        number=latest.number + 1 if latest else 1,
+        created_at=now,
+        updated_at=now,
+    )
+    _fill_revision(db, revision, chapter, latest.base_number if latest else None)
+    db.add(revision)
+    db.flush()
+    _prune_revisions(db, chapter.id, now)
+    return revision
+
+
+def list_revisions(db: Session, chapter_id: str, limit: int | None = None, cursor: str | None = None) -> Page:
+    query = (
+        db.query(ChapterRevision)
+        .options(defer(ChapterRevision.payload, raiseload=True))
+        .filter(ChapterRevision.chapter_id == chapter_id)
+    )
+    return paginate(query, [(ChapterRevision.number, True)], limit, cursor)
+
+
+def get_revision(db: Session, chapter_id: str, number: int) -> Optional[ChapterRevision]:
+    return (
+        db.query(ChapterRevision)
+        .filter(ChapterRevision.chapter_id == chapter_id, ChapterRevision.number == number)
+        .first()
+    )
+
+
+def revision_content(db: Session, revision: ChapterRevision) -> str:
+    if revision.kind == KEYFRAME:
+        return decompress_text(revision.payload)
+    return _apply_delta(_keyframe_text(db, revision.chapter_id, revision.base_number), revision.payload)
+
+
+def diff_revision(db: Session, chapter: Chapter, revision: ChapterRevision, against: Optional[int] = None) -> str:
+    if against is None:
+        other_label, other_text = "current", chapter.content or ""
+    else:
+        other = get_revision(db, chapter.id, against)
+        if other is None:
+            raise ValueError("Revision not found")
+        other_label, other_text = f"r{other.number}", revision_content(db, other)
+    return "".join(
+        difflib.unified_diff(
+            revision_content(db, revision).splitlines(keepends=True),
+            other_text.splitlines(keepends=True),
+            fromfile=f"r{revision.number}",
+            tofile=other_label,
+        )
+    )
@@ -0,0 +1,405 @@
+import logging
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from typing import Iterable, NamedTuple
+
+from sqlalchemy import bindparam, delete, event, func, insert, inspect, or_, select, update
+from sqlalchemy.orm import Session, undefer
+
+from .. import database
+from ..config import get_settings
+from ..models import Chapter, Character, Novel, Outline, SearchPosting, WorldBuilding
+
+logger = logging.getLogger(__name__)
+
+_TERM_MAX_LENGTH = 32
+_SNIPPET_BEFORE = 30
+_SNIPPET_AFTER = 90
+_SEGMENT = re.compile(r"[㐀-䶿一-鿿豈-﫿]+|[a-z0-9]+")
+
+
+class SearchableDoc(NamedTuple):
+    doc_type: str
+    model: type
+    title_field: str
+    fields: dict[str, int]
+
+
+SEARCHABLE_DOCS = (
+    SearchableDoc("chapter", Chapter, "title", {"title": 3, "summary": 2, "content": 1}),
+    SearchableDoc(
+        "character",
+        Character,
+        "name",
+        {"name": 3, "description": 1, "personality": 1, "background": 1, "relationships": 1},
+    ),
+    SearchableDoc("outline", Outline, "title", {"title": 3, "content": 1}),
+    SearchableDoc("world_building", WorldBuilding, "title", {"title": 3, "content": 1}),
+)
+_DOCS_BY_MODEL = {doc.model: doc for doc in SEARCHABLE_DOCS}
+_DOCS_BY_TYPE = {doc.doc_type: doc for doc in SEARCHABLE_DOCS}
+
+
+class SearchHit(NamedTuple):
+    doc_type: str
+    id: str
+    novel_id: str
+    title: str
+    field: str
+    snippet: str
+    highlights: list[tuple[int, int]]
+    score: float
+
+
+def normalize_text(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+def _segments(text: str) -> list[str]:
+    return _SEGMENT.findall(normalize_text(text))
+
+
+def _segment_terms(segment: str) -> Iterable[str]:
+    if segment.isascii():
+        yield segment[:_TERM_MAX_LENGTH]
+    elif len(segment) == 1:
+        yield segment
+    else:
+        for i in range(len(segment) - 1):
+            yield segment[i : i + 2]
+
+
+def tokenize(text: str | None) -> Iterable[str]:
+    if not text:
+        return
+    for segment in _segments(text):
+        yield from _segment_terms(segment)
+        if len(segment) > 1 and not segment.isascii():
+            # The last character is otherwise only the tail of a bigram; index it
+            # alone so single-character queries can match every term by prefix.
+            yield segment[-1]
+
+
+def document_terms(doc: SearchableDoc, obj) -> Counter[str]:
+    weights: Counter[str] = Counter()
+    for field, weight in doc.fields.items():
+        for term in tokenize(getattr(obj, field)):
+            weights[term] += weight
+    return weights
+
+
+def _write_postings(
+    connection, doc_type: str, doc_id: str, novel_id: str, terms: Counter[str], new: bool = False
+) -> None:
+    table = SearchPosting.__table__
+    existing = {} if new else dict(
+        connection.execute(
+            select(table.c.term, table.c.weight).where(
+                table.c.doc_type == doc_type, table.c.doc_id == doc_id
+            )
+        ).all()
+    )
+    removed = [term for term in existing if term not in terms]
+    added = [
+        {"novel_id": novel_id, "term": term, "doc_type": doc_type, "doc_id": doc_id, "weight": weight}
+        for term, weight in terms.items()
+        if term not in existing
+    ]
+    changed = [
+        {"b_term": term, "b_weight": weight}
+        for term, weight in terms.items()
+        if term in existing and existing[term] != weight
+    ]
+    if removed:
+        connection.execute(
+            delete(table).where(
+                table.c.doc_type == doc_type, table.c.doc_id == doc_id, table.c.term.in_(removed)
+            )
+        )
+    if added:
+        connection.execute(insert(table), added)
+    if changed:
+        connection.execute(
+            update(table)
+            .where(
+                table.c.novel_id == novel_id,
+                table.c.term == bindparam("b_term"),
+                table.c.doc_type == doc_type,
+                table.c.doc_id == doc_id,
+            )
+            .values(weight=bindparam("b_weight")),
+            changed,
+        )
+
+
+def index_documents(connection, objs: Iterable, new: bool = False) -> None:
+    for obj in objs:
+        doc = _DOCS_BY_MODEL[type(obj)]
+        _write_postings(connection, doc.doc_type, obj.id, obj.novel_id, document_terms(doc, obj), new)
+
+
+def unindex_documents(connection, doc_type: str, doc_ids: list[str]) -> None:
+    if doc_ids:
+        table = SearchPosting.__table__
+        connection.execute(delete(table).where(table.c.doc_type == doc_type, table.c.doc_id.in_(doc_ids)))
+
+
+def _needs_reindex(doc: SearchableDoc, obj) -> bool:
+    state = inspect(obj)
+    if state.pending:
+        return True
+    for field in doc.fields:
+        history = state.attrs[field].history
+        if history.added and list(history.added) != list(history.deleted):
+            return True
+    return False
+
+
+_RETRY_MAX_SECONDS = 300.0
+_pending_docs: set[tuple[str, str]] = set()
+_pending_lock = threading.Lock()
+_flush_timer: threading.Timer | None = None
+_failures = 0
+
+
+def _start_flush_timer(delay: float) -> None:
+    global _flush_timer
+    if _flush_timer is None:
+        _flush_timer = threading.Timer(delay, flush_search_index)
+        _flush_timer.daemon = True
+        _flush_timer.start()
+
+
+def _queue_reindex(keys: set[tuple[str, str]]) -> None:
+    with _pending_lock:
+        _pending_docs.update(keys)
+        _start_flush_timer(get_settings().search_index_delay_seconds)
+
+
+def defer_reindex(session: Session, keys: set[tuple[str, str]]) -> None:
+    session.info.setdefault("search_reindex", set()).update(keys)
+
+
+def reindex_documents(db: Session, keys: Iterable[tuple[str, str]], batch_size: int = 200) -> int:
+    ids_by_type: dict[str, list[str]] = {}
+    for doc_type, doc_id in keys:
+        ids_by_type.setdefault(doc_type, []).append(doc_id)
+    indexed = 0
+    for doc_type, doc_ids in ids_by_type.items():
+        doc = _DOCS_BY_TYPE[doc_type]
+        for start in range(0, len(doc_ids), batch_size):
+            batch_ids = doc_ids[start : start + batch_size]
+            query = db.query(doc.model).filter(doc.model.id.in_(batch_ids))
+            if doc.model is Chapter:
+                query = query.options(undefer(Chapter.content))
+            objs = query.all()
+            index_documents(db.connection(), objs)
+            found = {obj.id for obj in objs}
+            unindex_documents(db.connection(), doc_type, [doc_id for doc_id in batch_ids if doc_id not in found])
+            db.expunge_all()
+            indexed += len(objs)
+    return indexed
+
+
+def flush_search_index() -> int:
+    global _flush_timer, _failures
+    with _pending_lock:
+        if _flush_timer is not None:
+            _flush_timer.cancel()
+            _flush_timer = None
+        keys = set(_pending_docs)
+        _pending_docs.clear()
+    if not keys:
+        return 0
+    db = database.SessionLocal()
+    try:
+        indexed = reindex_documents(db, keys)
+        db.commit()
+    except Exception:
+        db.rollback()
+        with _pending_lock:
+            _pending_docs.update(keys)
+            _failures += 1
+            delay = min(get_settings().search_index_delay_seconds * 2**_failures, _RETRY_MAX_SECONDS)
+            _start_flush_timer(delay)
+        logger.exception("Search reindex of %d documents failed, retrying in %.0fs", len(keys), delay)
+        return 0
+    finally:
+        db.close()
+    with _pending_lock:
+        _failures = 0
+    return indexed
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_search_postings(session: Session, flush_context) -> None:
+    changed = {
+        (_DOCS_BY_MODEL[type(obj)].doc_type, obj.id)
+        for obj in list(session.new) + list(session.dirty)
+        if type(obj) in _DOCS_BY_MODEL and _needs_reindex(_DOCS_BY_MODEL[type(obj)], obj)
+    }
+    if changed:
+        # Tokenizing a whole chapter on every autosave is the expensive part, so
+        # it is left to flush_search_index once the transaction has committed.
+        defer_reindex(session, changed)
+    deleted: dict[str, list[str]] = {}
+    for obj in session.deleted:
+        doc = _DOCS_BY_MODEL.get(type(obj))
+        if doc is not None:
+            deleted.setdefault(doc.doc_type, []).append(obj.id)
+    if deleted:
+        connection = session.connection()
+        for doc_type, doc_ids in deleted.items():
+            unindex_documents(connection, doc_type, doc_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _queue_search_reindex(session: Session) -> None:
+    keys = session.info.pop("search_reindex", None)
+    if keys:
+        _queue_reindex(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_search_reindex(session: Session) -> None:
+    session.info.pop("search_reindex", None)
+
+
+def rebuild_search_index(db: Session, novel_id: str | None = None, batch_size: int = 200) -> int:
+    indexed = 0
+    for doc in SEARCHABLE_DOCS:
+        last_id = ""
+        while True:
+            query = db.query(doc.model).filter(doc.model.id > last_id)
+            if doc.model is Chapter:
+                query = query.options(undefer(Chapter.content))
+            if novel_id:
+                query = query.filter(doc.model.novel_id == novel_id)
+            batch = query.order_by(doc.model.id.asc()).limit(batch_size).all()
+            if not batch:
+                break
+            index_documents(db.connection(), batch)
+            db.commit()
+            db.expunge_all()
+            indexed += len(batch)
+            last_id = batch[-1].id
+    return indexed
+
+
+def _locate(text: str, segments: list[str]) -> dict[str, tuple[int, int]]:
+    normalized = normalize_text(text)
+    found = {}
+    for segment in segments:
+        start = normalized.find(segment)
+        if start >= 0:
+            found[segment] = (normalized.count(segment), start)
+    return found
+
+
+def _snippet(text: str, spans: list[tuple[int, int]]) -> tuple[str, list[tuple[int, int]]]:
+    anchor = min(start for start, _ in spans)
+    start = max(anchor - _SNIPPET_BEFORE, 0)
+    end = min(anchor + _SNIPPET_AFTER, len(text))
+    source = text if len(normalize_text(text)) == len(text) else normalize_text(text)
+    snippet = source[start:end].replace("\n", " ")
+    highlights = [(s - start, e - start) for s, e in spans if s >= start and e <= end]
+    if start > 0:
+        snippet = "…" + snippet
+        highlights = [(s + 1, e + 1) for s, e in highlights]
+    if end < len(text):
+        snippet += "…"
+    return snippet, highlights
+
+
+def _match(doc: SearchableDoc, obj, segments: list[str]) -> SearchHit | None:
+    score = 0.0
+    covered: set[str] = set()
+    best = None
+    for field, weight in doc.fields.items():
+        text = getattr(obj, field)
+        if not text:
+            continue
+        found = _locate(text, segments)
+        if not found:
+            continue
+        covered.update(found)
+        score += sum(weight * (1 + math.log(count)) for count, _start in found.values())
+        rank = (len(found), -weight)
+        if best is None or rank > best[0]:
+            spans = [(start, start + len(segment)) for segment, (_count, start) in found.items()]
+            best = (rank, field, text, spans)
+    if best is None or len(covered) < len(segments):
+        return None
+    _rank, field, text, spans = best
+    snippet, highlights = _snippet(text, spans)
+    return SearchHit(
+        doc_type=doc.doc_type,
+        id=obj.id,
+        novel_id=obj.novel_id,
+        title=getattr(obj, doc.title_field),
+        field=field,
+        snippet=snippet,
+        highlights=highlights,
+        score=round(score, 4),
+    )
+
+
+def search_documents(
+    db: Session,
+    user_id: str,
+    query: str,
+    *,
+    novel_id: str | None = None,
+    doc_types: list[str] | None = None,
+    limit: int = 20,
+) -> list[SearchHit]:
+    segments = list(dict.fromkeys(_segments(query)))
+    if not segments:
+        return []
+    if doc_types and any(doc_type not in _DOCS_BY_TYPE for doc_type in doc_types):
+        raise ValueError("Invalid document type")
+
+    table = SearchPosting.__table__
+    terms = sorted(
+        {term for segment in segments if len(segment) > 1 or segment.isascii() for term in _segment_terms(segment)}
+    )
+    candidates = (
+        select(table.c.doc_type, table.c.doc_id)
+        .join(Novel, Novel.id == table.c.novel_id)
+        .where(Novel.user_id == user_id, Novel.is_banned == False)
+        .group_by(table.c.doc_type, table.c.doc_id)
+        .order_by(func.sum(table.c.weight).desc())
+        .limit(limit * 3)
+    )
+    if terms:
+        candidates = candidates.where(table.c.term.in_(terms)).having(
+            func.count(table.c.term) == len(terms)
+        )
+    else:
+        candidates = candidates.where(
+            or_(*[table.c.term.like(f"{segment}%") for segment in segments])
+        )
+    if novel_id:
+        candidates = candidates.where(table.c.novel_id == novel_id)
+    if doc_types:
+        candidates = candidates.where(table.c.doc_type.in_(doc_types))
+
+    ids_by_type: dict[str, list[str]] = {}
+    for doc_type, doc_id in db.execute(candidates):
+        ids_by_type.setdefault(doc_type, []).append(doc_id)
+
+    hits = []
+    for doc_type, doc_ids in ids_by_type.items():
+        doc = _DOCS_BY_TYPE[doc_type]
+        query = db.query(doc.model).filter(doc.model.id.in_(doc_ids))
+        if doc.model is Chapter:
+            query = query.options(undefer(Chapter.content))
+        for obj in query:
+            hit = _match(doc, obj, segments)
+            if hit is not None:
+                hits.append(hit)
+    hits.sort(key=lambda hit: hit.score, reverse=True)
+    return hits[:limit]
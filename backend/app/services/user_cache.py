@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..config import get_settings
+from ..models import User
+
+
+@dataclass(frozen=True)
+class CachedUser:
+    id: str
+    email: str
+    name: str | None
+    avatar: str | None
+    is_admin: bool
+    is_banned: bool
+    created_at: datetime | None
+    updated_at: datetime | None
+
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            name=user.name,
+            avatar=user.avatar,
+            is_admin=bool(user.is_admin),
+            is_banned=bool(user.is_banned),
+            created_at=user.created_at,
+            updated_at=user.updated_at,
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        for field in ("created_at", "updated_at"):
+            if data[field] is not None:
+                data[field] = data[field].isoformat()
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "CachedUser":
+        data = json.loads(raw)
+        for field in ("created_at", "updated_at"):
+            if data.get(field):
+                data[field] = datetime.fromisoformat(data[field])
+        return cls(**data)
+
+
+class LocalUserCache:
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, CachedUser]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def get(self, user_id: str) -> CachedUser | None:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    async def set(self, user: CachedUser) -> None:
+        with self._lock:
+            self._entries[user.id] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def delete(self, user_id: str) -> None:
+        self.delete_sync(user_id)
+
+    def delete_sync(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
+class RedisUserCache:
+    def __init__(self, url: str, ttl_seconds: float):
+        try:
+            from redis import asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("USER_CACHE_REDIS_URL is set but the 'redis' package is not installed.") from e
+        self._client = redis.Redis.from_url(url)
+        self._url = url
+        self._sync_client = None
+        self.ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _key(user_id: str) -> str:
+        return f"auth:user:{user_id}"
+
+    async def get(self, user_id: str) -> CachedUser | None:
+        raw = await self._client.get(self._key(user_id))
+        return CachedUser.from_json(raw) if raw else None
+
+    async def set(self, user: CachedUser) -> None:
+        await self._client.set(self._key(user.id), user.to_json(), px=int(self.ttl_seconds * 1000))
+
+    async def delete(self, user_id: str) -> None:
+        await self._client.delete(self._key(user_id))
+
+    def delete_sync(self, user_id: str) -> None:
+        # For sync callers with no event loop, such as background jobs and scripts.
+        if self._sync_client is None:
+            import redis
+
+            self._sync_client = redis.Redis.from_url(self._url)
+        self._sync_client.delete(self._key(user_id))
+
+
+_user_cache: LocalUserCache | RedisUserCache | None = None
+_pending_deletes: set[asyncio.Task] = set()
+
+
+def get_user_cache() -> LocalUserCache | RedisUserCache:
+    global _user_cache
+    if _user_cache is None:
+        settings = get_settings()
+        if settings.user_cache_redis_url:
+            _user_cache = RedisUserCache(settings.user_cache_redis_url, settings.user_cache_ttl_seconds)
+        else:
+            _user_cache = LocalUserCache(settings.user_cache_ttl_seconds, settings.user_cache_max_entries)
+    return _user_cache
+
+
+def _fetch_user(db: Session, user_id: str) -> CachedUser | None:
+    row = db.query(User).filter(User.id == user_id).first()
+    return CachedUser.from_user(row) if row else None
+
+
+async def load_current_user(db: AsyncSession, user_id: str) -> CachedUser | None:
+    cache = get_user_cache()
+    user = await cache.get(user_id)
+    if user is not None:
+        return user
+    user = await db.run_sync(_fetch_user, user_id)
+    if user is not None:
+        await cache.set(user)
+    return user
+
+
+def _schedule_delete(user_id: str) -> None:
+    # Sync session code running on the event loop hands the delete to the loop
+    # instead of blocking it on a Redis round trip; without a loop it runs inline.
+    cache = get_user_cache()
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        cache.delete_sync(user_id)
+        return
+    task = loop.create_task(cache.delete(user_id))
+    _pending_deletes.add(task)
+    task.add_done_callback(_pending_deletes.discard)
+
+
+def invalidate_user(db: Session, user_id: str) -> None:
+    _schedule_delete(user_id)
+    # Drop it again once the change is committed, so a request that re-read
+    # the old row before the commit cannot keep serving it for a full TTL.
+    event.listen(db, "after_commit", lambda _session: _schedule_delete(user_id), once=True)
@@ -26,8 +26,7 @@ def upsert_world_building(db: Session, user_id: str, novel: Novel, payload: Worl
         existing.content = payload.content
         existing.type = payload.type
         db.add(existing)
-        db.commit()
-        db.refresh(existing)
+        db.flush()
         return existing
 
     world_building = WorldBuilding(
@@ -38,14 +37,22 @@ def upsert_world_building(db: Session, user_id: str, novel: Novel, payload: Worl
         type=payload.type,
     )
     db.add(world_building)
-    db.commit()
-    db.refresh(world_building)
+    db.flush()
+    return world_building
+
+
+def update_world_building(db: Session, world_building: WorldBuilding, payload: WorldBuildingUpsert) -> WorldBuilding:
+    world_building.title = payload.title
+    world_building.content = payload.content
+    world_building.type = payload.type
+    db.add(world_building)
+    db.flush()
     return world_building
 
 
 def delete_world_building(db: Session, world_building: WorldBuilding) -> None:
     db.delete(world_building)
-    db.commit()
+    db.flush()
 
 
 def list_world_buildings(db: Session, user_id: str, novel_id: str | None = None) -> List[WorldBuilding]:
@@ -0,0 +1,51 @@
+import zlib
+
+FORMAT_RAW = 0
+FORMAT_ZLIB = 1
+FORMAT_ZSTD = 2
+
+_zstd = None
+
+
+def _zstandard():
+    global _zstd
+    if _zstd is None:
+        try:
+            import zstandard
+        except ImportError as e:
+            raise RuntimeError("zstd compression requires the 'zstandard' package.") from e
+        _zstd = zstandard
+    return _zstd
+
+
+def compress_bytes(data: bytes, codec: str = "zlib", level: int = 6, min_size: int = 0) -> bytes:
+    if codec == "none" or len(data) < min_size:
+        return bytes([FORMAT_RAW]) + data
+    if codec == "zstd":
+        return bytes([FORMAT_ZSTD]) + _zstandard().ZstdCompressor(level=level).compress(data)
+    return bytes([FORMAT_ZLIB]) + zlib.compress(data, level)
+
+
+def decompress_bytes(blob: bytes) -> bytes:
+    if not blob:
+        return b""
+    fmt = blob[0]
+    if fmt == FORMAT_RAW:
+        return blob[1:]
+    if fmt == FORMAT_ZLIB:
+        return zlib.decompress(blob[1:])
+    if fmt == FORMAT_ZSTD:
+        return _zstandard().ZstdDecompressor().decompress(blob[1:])
+    raise ValueError(f"Unknown compression format {fmt}")
+
+
+def is_compressed(blob: bytes) -> bool:
+    return bool(blob) and blob[0] in (FORMAT_RAW, FORMAT_ZLIB, FORMAT_ZSTD)
+
+
+def compress_text(text: str, **options) -> bytes:
+    return compress_bytes(text.encode("utf-8"), **options)
+
+
+def decompress_text(blob: bytes) -> str:
+    return decompress_bytes(blob).decode("utf-8")
@@ -0,0 +1,121 @@
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .metrics import Histogram, register_collector
+
+
+class PoolMetrics:
+    def __init__(self, name: str):
+        self.name = name
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.wait_seconds = Histogram()
+        self._lock = threading.Lock()
+
+    def incr(self, field: str) -> None:
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self, pool: QueuePool) -> dict:
+        return {
+            "name": self.name,
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "checkouts": self.checkouts,
+            "checkins": self.checkins,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_seconds": self.wait_seconds.snapshot(),
+        }
+
+
+_metrics: dict[str, PoolMetrics] = {}
+_engines: dict = {}
+
+
+def _metrics_for(name: str) -> PoolMetrics:
+    metrics = _metrics.get(name)
+    if metrics is None:
+        metrics = _metrics.setdefault(name, PoolMetrics(name))
+    return metrics
+
+
+class _TimedCheckoutMixin:
+    def connect(self):
+        metrics = _metrics_for(self._orig_logging_name)
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            metrics.incr("timeouts")
+            raise
+        finally:
+            metrics.wait_seconds.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine, name: str) -> None:
+    metrics = _metrics_for(name)
+    _engines[name] = engine
+
+    @event.listens_for(engine.pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr("connects")
+
+    @event.listens_for(engine.pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr("checkouts")
+
+    @event.listens_for(engine.pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.incr("checkins")
+
+    @event.listens_for(engine.pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+    @event.listens_for(engine.pool, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
+
+
+def pool_stats() -> list[dict]:
+    return [_metrics_for(name).snapshot(engine.pool) for name, engine in _engines.items()]
+
+
+_POOL_SERIES = (
+    ("db_pool_checked_out", "gauge", "checked_out", "Connections currently checked out."),
+    ("db_pool_overflow", "gauge", "overflow", "Overflow connections currently open."),
+    ("db_pool_checkouts_total", "counter", "checkouts", "Connection checkouts."),
+    ("db_pool_invalidations_total", "counter", "invalidations", "Invalidated connections."),
+    ("db_pool_timeouts_total", "counter", "timeouts", "Checkouts that timed out waiting for a connection."),
+)
+
+
+def _render_pool_metrics():
+    stats = pool_stats()
+    for name, kind, field, documentation in _POOL_SERIES:
+        yield f"# HELP {name} {documentation}"
+        yield f"# TYPE {name} {kind}"
+        for entry in stats:
+            yield f'{name}{{pool="{entry["name"]}"}} {entry[field]}'
+
+
+register_collector(_render_pool_metrics)
@@ -0,0 +1,75 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, NamedTuple, Sequence
+
+from fastapi import Response
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+
+class Page(NamedTuple):
+    items: list
+    next_cursor: str | None = None
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps([_dump_value(v) for v in values], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    try:
+        return [_load_value(v) for v in values]
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+
+def keyset_after(order_by: Sequence[tuple[Any, bool]], values: Sequence[Any]):
+    clauses = []
+    for idx, (column, descending) in enumerate(order_by):
+        equal_prefix = [order_by[i][0] == values[i] for i in range(idx)]
+        step = column < values[idx] if descending else column > values[idx]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def paginate(query: Query, order_by: Sequence[tuple[Any, bool]], limit: int | None, cursor: str | None) -> Page:
+    if cursor:
+        query = query.filter(keyset_after(order_by, decode_cursor(cursor, len(order_by))))
+    query = query.order_by(*[column.desc() if descending else column.asc() for column, descending in order_by])
+    if limit is None:
+        return Page(query.all())
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return Page(rows)
+    rows = rows[:limit]
+    last = rows[-1]
+    return Page(rows, encode_cursor([getattr(last, column.key) for column, _ in order_by]))
+
+
+def apply_page_headers(response: Response, page: Page) -> list:
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
@@ -0,0 +1,99 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from ..config import get_settings
+from .metrics import Counter, Gauge, HistogramFamily
+from .security import (
+    BCRYPT_MIN_ROUNDS,
+    calibrate_bcrypt_rounds,
+    check_bcrypt_rounds,
+    check_password_length,
+    get_password_hash,
+    password_hash_rounds,
+    verify_password,
+)
+
+PASSWORD_HASH_SECONDS = HistogramFamily(
+    "password_hash_duration_seconds", "Password hash/verify latency including queueing.", ("op",)
+)
+PASSWORD_HASH_PENDING = Gauge("password_hash_pending", "Password hash/verify calls queued or running.")
+PASSWORD_HASH_REJECTED = Counter("password_hash_rejected_total", "Password hash/verify calls rejected as overloaded.")
+
+
+class PasswordHasherBusy(RuntimeError):
+    pass
+
+
+_executor: ProcessPoolExecutor | None = None
+_rounds: int | None = None
+_pending = 0
+
+
+def _worker_count() -> int:
+    # Every uvicorn worker owns a pool, so keep it small rather than one per core.
+    return max(get_settings().password_hash_workers, 1)
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=_worker_count(), mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+
+async def _submit(op: str, fn, *args):
+    global _pending
+    if _pending >= _worker_count() + get_settings().password_hash_queue_size:
+        PASSWORD_HASH_REJECTED.labels().inc()
+        raise PasswordHasherBusy("Password hashing is overloaded, retry shortly.")
+    _pending += 1
+    PASSWORD_HASH_PENDING.labels().inc()
+    start = time.perf_counter()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_get_executor(), fn, *args)
+    finally:
+        _pending -= 1
+        PASSWORD_HASH_PENDING.labels().dec()
+        PASSWORD_HASH_SECONDS.labels(op).observe(time.perf_counter() - start)
+
+
+async def start_password_hasher() -> int:
+    global _rounds
+    settings = get_settings()
+    if settings.password_hash_rounds is not None:
+        check_bcrypt_rounds(settings.password_hash_rounds)
+        _rounds = settings.password_hash_rounds
+    else:
+        _rounds = await asyncio.get_running_loop().run_in_executor(
+            _get_executor(), calibrate_bcrypt_rounds, settings.password_hash_target_ms / 1000
+        )
+    return _rounds
+
+
+def shutdown_password_hasher() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def current_rounds() -> int:
+    return max(_rounds or get_settings().password_hash_rounds or BCRYPT_MIN_ROUNDS, BCRYPT_MIN_ROUNDS)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    rounds = password_hash_rounds(hashed_password)
+    return rounds is not None and rounds < current_rounds()
+
+
+async def hash_password(password: str) -> str:
+    check_password_length(password)
+    return await _submit("hash", get_password_hash, password, current_rounds())
+
+
+async def check_password(password: str, hashed_password: str) -> bool:
+    return await _submit("verify", verify_password, password, hashed_password)
@@ -1,15 +1,21 @@
+import time
 import uuid
 from datetime import datetime, timedelta
 
 import bcrypt
-from jose import jwt, JWTError
+from jose import JWTError
 
 from ..config import get_settings
 from ..schemas import TokenData
+from .tokens import get_jwt_backend, verify_token
 
 settings = get_settings()
 
 _BCRYPT_MAX_PASSWORD_BYTES = 72
+# Never hash below bcrypt's default cost of 12, which every existing hash used.
+BCRYPT_MIN_ROUNDS = 12
+_BCRYPT_MAX_ROUNDS = 15
+_BCRYPT_CALIBRATION_ROUNDS = 10
 
 
 def generate_uuid() -> str:
@@ -23,23 +29,49 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         return False
 
 
-def get_password_hash(password: str) -> str:
-    password_bytes = password.encode("utf-8")
-    if len(password_bytes) > _BCRYPT_MAX_PASSWORD_BYTES:
+def check_password_length(password: str) -> None:
+    if len(password.encode("utf-8")) > _BCRYPT_MAX_PASSWORD_BYTES:
         raise ValueError("Password too long (bcrypt max 72 bytes).")
-    salt = bcrypt.gensalt()
-    return bcrypt.hashpw(password_bytes, salt).decode("utf-8")
+
+
+def get_password_hash(password: str, rounds: int = 12) -> str:
+    check_password_length(password)
+    salt = bcrypt.gensalt(rounds)
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
+
+
+def password_hash_rounds(hashed_password: str) -> int | None:
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def check_bcrypt_rounds(rounds: int) -> None:
+    if not BCRYPT_MIN_ROUNDS <= rounds <= _BCRYPT_MAX_ROUNDS:
+        raise ValueError(f"bcrypt rounds must be between {BCRYPT_MIN_ROUNDS} and {_BCRYPT_MAX_ROUNDS}.")
+
+
+def calibrate_bcrypt_rounds(target_seconds: float) -> int:
+    start = time.perf_counter()
+    bcrypt.hashpw(b"calibration", bcrypt.gensalt(_BCRYPT_CALIBRATION_ROUNDS))
+    elapsed = time.perf_counter() - start
+    rounds = _BCRYPT_CALIBRATION_ROUNDS
+    while rounds < _BCRYPT_MAX_ROUNDS and elapsed * 2 <= target_seconds:
+        rounds += 1
+        elapsed *= 2
+    return max(rounds, BCRYPT_MIN_ROUNDS)
 
 
 def create_access_token(subject: str) -> str:
     expire = datetime.utcnow() + timedelta(minutes=settings.access_token_expire_minutes)
     payload = {"sub": subject, "exp": expire}
-    return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
+    return get_jwt_backend().encode(payload)
 
 
 def decode_token(token: str) -> TokenData:
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        payload = verify_token(token)
         return TokenData(user_id=payload.get("sub"))
     except JWTError:
         return TokenData(user_id=None)
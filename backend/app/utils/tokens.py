@@ -0,0 +1,156 @@
+import base64
+import binascii
+import calendar
+import hashlib
+import hmac
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from jose import JWTError, jwt
+
+from ..config import get_settings
+from .metrics import Counter
+
+AUTH_TOKEN_CACHE = Counter("auth_token_cache_total", "Verified-token cache lookups by result.", ("result",))
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def _json_bytes(data: dict) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+class JoseBackend:
+    def __init__(self, secret: str, algorithm: str):
+        self.secret = secret
+        self.algorithm = algorithm
+
+    def encode(self, claims: dict) -> str:
+        return jwt.encode(claims, self.secret, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        return jwt.decode(token, self.secret, algorithms=[self.algorithm])
+
+
+class NativeHMACBackend:
+    ALGORITHMS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+    def __init__(self, secret: str, algorithm: str):
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Unsupported algorithm {algorithm}")
+        self.algorithm = algorithm
+        self._key = secret.encode("utf-8")
+        self._digest = self.ALGORITHMS[algorithm]
+        self._header = _b64encode(_json_bytes({"alg": algorithm, "typ": "JWT"}))
+
+    def _sign(self, signing_input: str) -> bytes:
+        return hmac.new(self._key, signing_input.encode("ascii"), self._digest).digest()
+
+    def encode(self, claims: dict) -> str:
+        claims = {
+            key: calendar.timegm(value.utctimetuple()) if isinstance(value, datetime) else value
+            for key, value in claims.items()
+        }
+        signing_input = f"{self._header}.{_b64encode(_json_bytes(claims))}"
+        return f"{signing_input}.{_b64encode(self._sign(signing_input))}"
+
+    def decode(self, token: str) -> dict:
+        try:
+            signing_input, _, signature = token.rpartition(".")
+            header_segment, _, payload_segment = signing_input.partition(".")
+            header = json.loads(_b64decode(header_segment))
+            if not isinstance(header, dict) or header.get("alg") != self.algorithm:
+                raise JWTError("The specified alg value is not allowed")
+            if not hmac.compare_digest(self._sign(signing_input), _b64decode(signature)):
+                raise JWTError("Signature verification failed.")
+            claims = json.loads(_b64decode(payload_segment))
+        except (ValueError, TypeError, binascii.Error) as e:
+            raise JWTError("Invalid token.") from e
+        if not isinstance(claims, dict):
+            raise JWTError("Invalid payload.")
+        now = time.time()
+        for claim in ("exp", "nbf"):
+            if claim in claims and not isinstance(claims[claim], (int, float)):
+                raise JWTError(f"Invalid {claim} claim.")
+        if "exp" in claims and claims["exp"] < now:
+            raise JWTError("Signature has expired.")
+        if "nbf" in claims and claims["nbf"] > now:
+            raise JWTError("The token is not yet valid (nbf)")
+        return claims
+
+
+class VerifiedTokenCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not isinstance(exp, (int, float)) or self.max_entries <= 0:
+            return
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (exp, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_backend: JoseBackend | NativeHMACBackend | None = None
+_token_cache: VerifiedTokenCache | None = None
+
+
+def get_jwt_backend() -> JoseBackend | NativeHMACBackend:
+    global _backend
+    if _backend is None:
+        settings = get_settings()
+        if settings.jwt_backend == "native" and settings.algorithm in NativeHMACBackend.ALGORITHMS:
+            _backend = NativeHMACBackend(settings.secret_key, settings.algorithm)
+        else:
+            _backend = JoseBackend(settings.secret_key, settings.algorithm)
+    return _backend
+
+
+def get_token_cache() -> VerifiedTokenCache:
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = VerifiedTokenCache(get_settings().token_cache_max_entries)
+    return _token_cache
+
+
+def verify_token(token: str) -> dict:
+    cache = get_token_cache()
+    claims = cache.get(token)
+    if claims is not None:
+        AUTH_TOKEN_CACHE.labels("hit").inc()
+        return claims
+    AUTH_TOKEN_CACHE.labels("miss").inc()
+    claims = get_jwt_backend().decode(token)
+    cache.set(token, claims)
+    return claims
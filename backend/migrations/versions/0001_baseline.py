@@ -0,0 +1,137 @@
+"""baseline schema
+
+Revision ID: 0001_baseline
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+Databases that were bootstrapped with Base.metadata.create_all (and the
+hand-run admin ALTER TABLE statements) already have some or all of these
+objects, so every step only creates what is missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001_baseline"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _tables() -> set[str]:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _columns(table: str) -> set[str]:
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    tables = _tables()
+
+    if "users" not in tables:
+        op.create_table(
+            "users",
+            sa.Column("id", sa.String(36), primary_key=True, index=True),
+            sa.Column("email", sa.String(255), nullable=False, unique=True, index=True),
+            sa.Column("name", sa.String(100), nullable=True),
+            sa.Column("avatar", sa.String(500), nullable=True),
+            sa.Column("password", sa.String(255), nullable=False),
+            sa.Column("is_admin", sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column("is_banned", sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column("email_verified", sa.DateTime(), nullable=True),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+    else:
+        columns = _columns("users")
+        if "is_admin" not in columns:
+            op.add_column("users", sa.Column("is_admin", sa.Boolean(), nullable=False, server_default=sa.false()))
+        if "is_banned" not in columns:
+            op.add_column("users", sa.Column("is_banned", sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    if "novels" not in tables:
+        op.create_table(
+            "novels",
+            sa.Column("id", sa.String(36), primary_key=True, index=True),
+            sa.Column("title", sa.String(255), nullable=False),
+            sa.Column("description", sa.String(500), nullable=True),
+            sa.Column("genre", sa.String(100), nullable=True),
+            sa.Column("status", sa.String(50), nullable=True),
+            sa.Column("cover_image", sa.String(500), nullable=True),
+            sa.Column("tags", sa.String(255), nullable=True),
+            sa.Column("is_banned", sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column("word_count", sa.Integer(), nullable=True),
+            sa.Column("chapter_count", sa.Integer(), nullable=True),
+            sa.Column("user_id", sa.String(36), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+    elif "is_banned" not in _columns("novels"):
+        op.add_column("novels", sa.Column("is_banned", sa.Boolean(), nullable=False, server_default=sa.false()))
+
+    if "chapters" not in tables:
+        op.create_table(
+            "chapters",
+            sa.Column("id", sa.String(36), primary_key=True, index=True),
+            sa.Column("title", sa.String(255), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("summary", sa.Text(), nullable=True),
+            sa.Column("word_count", sa.Integer(), nullable=True),
+            sa.Column("order", sa.Integer(), nullable=True),
+            sa.Column("status", sa.String(50), nullable=True),
+            sa.Column("novel_id", sa.String(36), sa.ForeignKey("novels.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+
+    if "characters" not in tables:
+        op.create_table(
+            "characters",
+            sa.Column("id", sa.String(36), primary_key=True, index=True),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("description", sa.Text(), nullable=True),
+            sa.Column("avatar", sa.String(500), nullable=True),
+            sa.Column("personality", sa.Text(), nullable=True),
+            sa.Column("background", sa.Text(), nullable=True),
+            sa.Column("relationships", sa.Text(), nullable=True),
+            sa.Column("novel_id", sa.String(36), sa.ForeignKey("novels.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+
+    if "outlines" not in tables:
+        op.create_table(
+            "outlines",
+            sa.Column("id", sa.String(36), primary_key=True, index=True),
+            sa.Column("title", sa.String(255), nullable=False),
+            sa.Column("content", sa.Text(), nullable=True),
+            sa.Column("chapter_range", sa.String(255), nullable=True),
+            sa.Column("order", sa.Integer(), nullable=True),
+            sa.Column("novel_id", sa.String(36), sa.ForeignKey("novels.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+
+    if "world_buildings" not in tables:
+        op.create_table(
+            "world_buildings",
+            sa.Column("id", sa.String(36), primary_key=True, index=True),
+            sa.Column("title", sa.String(255), nullable=False),
+            sa.Column("content", sa.Text(), nullable=False),
+            sa.Column("type", sa.String(100), nullable=False),
+            sa.Column(
+                "novel_id",
+                sa.String(36),
+                sa.ForeignKey("novels.id", ondelete="CASCADE"),
+                nullable=False,
+                unique=True,
+            ),
+            sa.Column("created_at", sa.DateTime(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    for table in ("world_buildings", "outlines", "characters", "chapters", "novels", "users"):
+        op.drop_table(table)
@@ -0,0 +1,38 @@
+"""composite indexes for the ownership join and list orderings
+
+Revision ID: 0002_ownership_indexes
+Revises: 0001_baseline
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_ownership_indexes"
+down_revision = "0001_baseline"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_chapters_novel_order_created", "chapters", ["novel_id", "order", "created_at"]),
+    ("ix_outlines_novel_order_created", "outlines", ["novel_id", "order", "created_at"]),
+    ("ix_characters_novel_created", "characters", ["novel_id", "created_at"]),
+    ("ix_novels_user_banned_created", "novels", ["user_id", "is_banned", "created_at"]),
+    ("ix_novels_updated", "novels", ["updated_at"]),
+    ("ix_users_created", "users", ["created_at"]),
+]
+
+
+def _index_names(table: str) -> set[str]:
+    return {index["name"] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        if name not in _index_names(table):
+            op.create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,24 @@
+"""index for the admin novel listing sorted by creation time
+
+Revision ID: 0003_admin_novel_indexes
+Revises: 0002_ownership_indexes
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003_admin_novel_indexes"
+down_revision = "0002_ownership_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    names = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("novels")}
+    if "ix_novels_created" not in names:
+        op.create_index("ix_novels_created", "novels", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_novels_created", table_name="novels")
@@ -0,0 +1,36 @@
+"""inverted index postings for full-text search
+
+Revision ID: 0004_search_postings
+Revises: 0003_admin_novel_indexes
+Create Date: 2026-10-18 00:00:00
+
+The table starts empty; existing documents are indexed with
+POST /admin/search/reindex.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004_search_postings"
+down_revision = "0003_admin_novel_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "search_postings" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "search_postings",
+        sa.Column("novel_id", sa.String(36), sa.ForeignKey("novels.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("term", sa.String(32), primary_key=True),
+        sa.Column("doc_type", sa.String(20), primary_key=True),
+        sa.Column("doc_id", sa.String(36), primary_key=True),
+        sa.Column("weight", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_search_postings_doc", "search_postings", ["doc_type", "doc_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_search_postings_doc", table_name="search_postings")
+    op.drop_table("search_postings")
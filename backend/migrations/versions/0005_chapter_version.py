@@ -0,0 +1,24 @@
+"""content version counter on chapters for optimistic concurrency
+
+Revision ID: 0005_chapter_version
+Revises: 0004_search_postings
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005_chapter_version"
+down_revision = "0004_search_postings"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("chapters")}
+    if "version" not in columns:
+        op.add_column("chapters", sa.Column("version", sa.Integer(), nullable=False, server_default="1"))
+
+
+def downgrade() -> None:
+    op.drop_column("chapters", "version")
@@ -0,0 +1,39 @@
+"""chapter revision history (keyframes plus compressed line deltas)
+
+Revision ID: 0006_chapter_revisions
+Revises: 0005_chapter_version
+Create Date: 2026-10-18 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+revision = "0006_chapter_revisions"
+down_revision = "0005_chapter_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "chapter_revisions" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "chapter_revisions",
+        sa.Column("id", sa.String(36), primary_key=True),
+        sa.Column("chapter_id", sa.String(36), sa.ForeignKey("chapters.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("number", sa.Integer(), nullable=False),
+        sa.Column("kind", sa.String(10), nullable=False),
+        sa.Column("base_number", sa.Integer(), nullable=False),
+        sa.Column("payload", sa.LargeBinary().with_variant(mysql.MEDIUMBLOB(), "mysql"), nullable=False),
+        sa.Column("title", sa.String(255), nullable=False),
+        sa.Column("word_count", sa.Integer(), nullable=True),
+        sa.Column("chapter_version", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("chapter_id", "number", name="uq_chapter_revisions_chapter_number"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("chapter_revisions")
@@ -0,0 +1,40 @@
+"""store chapter content as compressed MEDIUMBLOB
+
+Revision ID: 0007_compressed_chapter_content
+Revises: 0006_chapter_revisions
+Create Date: 2026-10-18 00:00:00
+
+Converting TEXT to MEDIUMBLOB keeps each row's UTF-8 bytes, which the
+CompressedText type still reads. POST /admin/chapters/compress rewrites them
+in compressed form in the background.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+revision = "0007_compressed_chapter_content"
+down_revision = "0006_chapter_revisions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("chapters") as batch:
+        batch.alter_column(
+            "content",
+            existing_type=sa.Text(),
+            type_=sa.LargeBinary().with_variant(mysql.MEDIUMBLOB(), "mysql"),
+            existing_nullable=False,
+        )
+
+
+def downgrade() -> None:
+    # Compressed rows are not valid text; they must be decompressed before downgrading.
+    with op.batch_alter_table("chapters") as batch:
+        batch.alter_column(
+            "content",
+            existing_type=sa.LargeBinary().with_variant(mysql.MEDIUMBLOB(), "mysql"),
+            type_=sa.Text(),
+            existing_nullable=False,
+        )
@@ -0,0 +1,124 @@
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import database
+from app.api import admin
+from app.database import Base
+from app.main import app
+from app.models import Novel, User
+from app.services import search_service, user_cache
+from app.utils.query_stats import QueryStats, begin_query_stats, end_query_stats
+from app.utils.security import create_access_token
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(max_statements): fail the test if its body executes more SQL statements"
+    )
+
+
+def _budget_report(stats: QueryStats, max_statements: int) -> str:
+    lines = [f"executed {stats.count} SQL statements, budget is {max_statements}"]
+    lines.extend(f"  {count}x {shape}" for shape, count in stats.repeated())
+    return "\n".join(lines)
+
+
+@contextmanager
+def _enforce_budget(max_statements: int):
+    stats = QueryStats()
+    stats.track_shapes()
+    token = begin_query_stats(stats)
+    try:
+        yield stats
+    finally:
+        end_query_stats(token)
+    if stats.count > max_statements:
+        pytest.fail(_budget_report(stats, max_statements), pytrace=False)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    with _enforce_budget(marker.args[0]):
+        return (yield)
+
+
+@pytest.fixture
+def query_budget():
+    return _enforce_budget
+
+
+@pytest.fixture
+def query_stats():
+    stats = QueryStats()
+    stats.track_shapes()
+    token = begin_query_stats(stats)
+    yield stats
+    end_query_stats(token)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(tmp_path, engine, session_factory, monkeypatch):
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    async_session_factory = async_sessionmaker(
+        async_engine,
+        autoflush=False,
+        expire_on_commit=False,
+        class_=AsyncSession,
+        sync_session_class=database._PrimarySession,
+    )
+    monkeypatch.setattr(database, "SessionLocal", session_factory)
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_session_factory)
+    monkeypatch.setattr(admin, "SessionLocal", session_factory)
+    monkeypatch.setattr(user_cache, "_user_cache", None)
+    yield TestClient(app)
+    search_service.flush_search_index()
+    async_engine.sync_engine.dispose()
+
+
+@pytest.fixture
+def user(db):
+    user = User(id="user-1", email="writer@example.com", password="!", name="writer")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    return {"Authorization": f"Bearer {create_access_token(user.id)}"}
+
+
+@pytest.fixture
+def novel(db, user):
+    novel = Novel(id="novel-1", title="测试小说", user_id=user.id)
+    db.add(novel)
+    db.commit()
+    return novel
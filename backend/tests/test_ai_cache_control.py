@@ -0,0 +1,55 @@
+import httpx
+import pytest
+
+from app.api.ai import _bypass_cache
+from app.config import get_settings
+from app.services import ai_cache, ai_service
+
+MESSAGES = [{"role": "user", "content": "给主角起名"}]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.mark.parametrize(
+    "header, flags",
+    [
+        (None, (False, False)),
+        ("max-age=0", (False, False)),
+        ("no-cache", (True, False)),
+        ("No-Store", (True, True)),
+        ("no-cache, no-store", (True, True)),
+    ],
+)
+def test_cache_control_directives(header, flags):
+    assert _bypass_cache(header) == flags
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return httpx.Response(200, json={"choices": [{"message": {"content": f"名字{len(calls)}"}}]})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(get_settings(), "doubao_api_key", "test-key")
+    monkeypatch.setattr(get_settings(), "ai_cache_dir", None)
+    monkeypatch.setattr(ai_cache, "_response_cache", None)
+    monkeypatch.setattr(ai_service, "get_http_client", lambda: client)
+    return calls
+
+
+@pytest.mark.anyio
+async def test_no_store_skips_lookup_and_store(upstream):
+    first = await ai_service.doubao_chat(MESSAGES, use_cache=True)
+    fresh = await ai_service.doubao_chat(MESSAGES, use_cache=True, refresh_cache=True, no_store=True)
+    cached = await ai_service.doubao_chat(MESSAGES, use_cache=True)
+
+    assert len(upstream) == 2
+    assert fresh != first
+    assert cached == first
+    assert ai_cache.get_response_cache().stores == 1
@@ -0,0 +1,92 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import get_settings
+from app.services import ai_service
+
+MESSAGES = [{"role": "user", "content": "续写第一章"}]
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class CountingUpstream:
+    def __init__(self):
+        self.calls = 0
+        self.started = asyncio.Event()
+        self.release = asyncio.Event()
+        self.cancelled = False
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        self.started.set()
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return httpx.Response(200, json={"choices": [{"message": {"content": "好的"}}], "usage": {"total_tokens": 3}})
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    upstream = CountingUpstream()
+    client = httpx.AsyncClient(transport=httpx.MockTransport(upstream.handler))
+    monkeypatch.setattr(get_settings(), "doubao_api_key", "test-key")
+    monkeypatch.setattr(ai_service, "get_http_client", lambda: client)
+    yield upstream
+    assert not ai_service._inflight
+
+
+@pytest.mark.anyio
+async def test_concurrent_identical_calls_share_one_upstream_request(upstream):
+    calls = [asyncio.create_task(ai_service.doubao_chat(MESSAGES)) for _ in range(10)]
+    await upstream.started.wait()
+    upstream.release.set()
+    results = await asyncio.gather(*calls)
+
+    assert upstream.calls == 1
+    assert all(result == results[0] for result in results)
+
+
+@pytest.mark.anyio
+async def test_different_payloads_are_not_coalesced(upstream):
+    upstream.release.set()
+    await asyncio.gather(
+        ai_service.doubao_chat(MESSAGES),
+        ai_service.doubao_chat(MESSAGES, temperature=0.2),
+    )
+
+    assert upstream.calls == 2
+
+
+@pytest.mark.anyio
+async def test_cancelling_one_waiter_keeps_the_others(upstream):
+    calls = [asyncio.create_task(ai_service.doubao_chat(MESSAGES)) for _ in range(3)]
+    await upstream.started.wait()
+    calls[0].cancel()
+    await asyncio.sleep(0)
+    upstream.release.set()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+
+    assert isinstance(results[0], asyncio.CancelledError)
+    assert results[1]["choices"] and results[1] == results[2]
+    assert upstream.calls == 1
+    assert not upstream.cancelled
+
+
+@pytest.mark.anyio
+async def test_cancelling_every_waiter_cancels_the_upstream_call(upstream):
+    calls = [asyncio.create_task(ai_service.doubao_chat(MESSAGES)) for _ in range(3)]
+    await upstream.started.wait()
+    for call in calls:
+        call.cancel()
+    results = await asyncio.gather(*calls, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert upstream.cancelled
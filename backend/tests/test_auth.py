@@ -0,0 +1,46 @@
+import pytest
+
+from app.api import auth
+from app.config import get_settings
+from app.utils import password_hasher
+from app.utils.security import calibrate_bcrypt_rounds, check_bcrypt_rounds
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def test_duplicate_registration_skips_password_hashing(client, user, monkeypatch):
+    hashed = []
+
+    async def fake_hash(password):
+        hashed.append(password)
+        return "!"
+
+    monkeypatch.setattr(auth, "hash_password", fake_hash)
+    response = client.post("/auth/register", json={"email": user.email, "password": "secret-password"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email already registered"
+    assert hashed == []
+
+
+def test_calibration_never_goes_below_default_cost():
+    assert calibrate_bcrypt_rounds(0.0) == 12
+
+
+def test_explicit_rounds_below_default_cost_are_rejected():
+    with pytest.raises(ValueError):
+        check_bcrypt_rounds(10)
+    check_bcrypt_rounds(12)
+
+
+@pytest.mark.anyio
+async def test_password_hasher_refuses_weak_configured_rounds(monkeypatch):
+    monkeypatch.setattr(get_settings(), "password_hash_rounds", 10)
+    monkeypatch.setattr(password_hasher, "_rounds", None)
+
+    with pytest.raises(ValueError):
+        await password_hasher.start_password_hasher()
+    assert password_hasher.current_rounds() == 12
@@ -0,0 +1,55 @@
+from sqlalchemy import LargeBinary, event, type_coerce, update
+from sqlalchemy.sql import Update
+
+from app.models import Chapter
+from app.services import compress_chapter_contents
+from app.utils.compression import is_compressed
+
+_raw = type_coerce(Chapter.__table__.c.content, LargeBinary)
+
+
+def _add_legacy_chapter(db, novel, chapter_id, text):
+    db.add(Chapter(id=chapter_id, novel_id=novel.id, title=chapter_id, content="", order=1024))
+    db.commit()
+    db.execute(
+        update(Chapter.__table__)
+        .where(Chapter.__table__.c.id == chapter_id)
+        .values({Chapter.__table__.c.content: type_coerce(text.encode("utf-8"), LargeBinary)})
+    )
+    db.commit()
+
+
+def _raw_content(db, chapter_id):
+    return bytes(db.execute(Chapter.__table__.select().with_only_columns(_raw).where(Chapter.id == chapter_id)).scalar())
+
+
+def test_backfill_compresses_legacy_rows(db, novel):
+    _add_legacy_chapter(db, novel, "chapter-1", "天地玄黄。" * 100)
+
+    assert compress_chapter_contents(db) == 1
+
+    assert is_compressed(_raw_content(db, "chapter-1"))
+    db.expire_all()
+    assert db.get(Chapter, "chapter-1").content == "天地玄黄。" * 100
+
+
+def test_backfill_does_not_revert_a_concurrent_save(db, novel):
+    _add_legacy_chapter(db, novel, "chapter-1", "旧的正文。" * 100)
+    saved = []
+
+    @event.listens_for(db, "do_orm_execute")
+    def autosave_first(state):
+        if isinstance(state.statement, Update) and not saved:
+            saved.append(True)
+            state.session.connection().execute(
+                update(Chapter.__table__)
+                .where(Chapter.__table__.c.id == "chapter-1")
+                .values(content="新的正文。", version=Chapter.__table__.c.version + 1)
+            )
+
+    assert compress_chapter_contents(db) == 0
+
+    db.expire_all()
+    chapter = db.get(Chapter, "chapter-1")
+    assert chapter.content == "新的正文。"
+    assert chapter.version == 2
@@ -0,0 +1,41 @@
+import pytest
+
+from app.models import Chapter
+
+
+@pytest.fixture
+def chapters(db, novel, client, auth_headers):
+    for i in range(1, 4):
+        db.add(Chapter(id=f"chapter-{i}", novel_id=novel.id, title=f"第{i}章", content="正文" * 500, order=i * 1024))
+    db.commit()
+    client.get("/auth/me", headers=auth_headers)
+
+
+def _move(client, auth_headers, novel, chapter_id, **anchor):
+    response = client.post(f"/novels/{novel.id}/chapters/{chapter_id}/move", json=anchor, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _orders(db, novel):
+    db.expire_all()
+    return [(c.id, c.order) for c in db.query(Chapter).filter(Chapter.novel_id == novel.id).order_by(Chapter.order)]
+
+
+def test_move_does_not_load_chapter_content(client, auth_headers, novel, chapters, query_stats):
+    _move(client, auth_headers, novel, "chapter-3", after_id="chapter-1")
+
+    assert not any("content" in shape for shape in query_stats.shapes)
+
+
+def test_moving_before_first_keeps_orders_positive(client, db, auth_headers, novel, chapters):
+    moved = "chapter-3"
+    for _ in range(12):
+        first = _orders(db, novel)[0][0]
+        moved = next(cid for cid, _ in reversed(_orders(db, novel)) if cid != first)
+        _move(client, auth_headers, novel, moved, before_id=first)
+
+        orders = _orders(db, novel)
+        assert orders[0][0] == moved
+        assert all(order > 0 for _, order in orders)
+    assert len({order for _, order in orders}) == 3
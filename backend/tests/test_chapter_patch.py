@@ -0,0 +1,32 @@
+import pytest
+
+from app.models import Chapter
+
+
+@pytest.fixture
+def chapter(db, novel):
+    chapter = Chapter(id="chapter-1", novel_id=novel.id, title="第1章", content="天地玄黄", order=1024, word_count=4)
+    db.add(chapter)
+    db.commit()
+    return chapter
+
+
+def _patch(client, auth_headers, body):
+    response = client.patch("/chapters/chapter-1", json=body, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+@pytest.mark.parametrize("body", [{"status": "published"}, {}])
+def test_status_only_patch_keeps_version(client, auth_headers, chapter, body):
+    assert _patch(client, auth_headers, {"base_version": 1, **body})["version"] == 1
+    assert _patch(client, auth_headers, {"base_version": 1, "ops": [{"start": 4, "end": 4, "text": "。"}]})["version"] == 2
+
+
+@pytest.mark.parametrize(
+    "body", [{"ops": [{"start": 0, "end": 2, "text": "宇宙"}]}, {"title": "新标题"}, {"summary": "摘要"}]
+)
+def test_versioned_patch_bumps_version(client, auth_headers, chapter, body):
+    assert _patch(client, auth_headers, {"base_version": 1, **body})["version"] == 2
+    response = client.patch("/chapters/chapter-1", json={"base_version": 1, "status": "draft"}, headers=auth_headers)
+    assert response.status_code == 409
@@ -0,0 +1,55 @@
+import pytest
+
+from app.models import Chapter
+
+
+@pytest.fixture
+def chapters(db, novel, client, auth_headers):
+    def seed(count):
+        for i in range(1, count + 1):
+            db.add(
+                Chapter(
+                    id=f"chapter-{i}",
+                    novel_id=novel.id,
+                    title=f"第{i}章",
+                    content="天地玄黄，宇宙洪荒。" * 10,
+                    order=i * 1024,
+                    word_count=100,
+                )
+            )
+        db.commit()
+
+    client.get("/auth/me", headers=auth_headers)
+    return seed
+
+
+def _statements(query_stats, call):
+    before = query_stats.count
+    response = call()
+    assert response.status_code < 300, response.text
+    return query_stats.count - before
+
+
+@pytest.mark.parametrize("count", [2, 20])
+def test_chapter_reads_use_fixed_statement_counts(client, auth_headers, novel, chapters, query_stats, count):
+    chapters(count)
+    base = f"/novels/{novel.id}/chapters"
+
+    assert _statements(query_stats, lambda: client.get(f"{base}/", headers=auth_headers)) == 2
+    assert _statements(query_stats, lambda: client.get(f"{base}/?limit=5", headers=auth_headers)) == 2
+    assert _statements(query_stats, lambda: client.get(f"{base}/index", headers=auth_headers)) == 2
+    assert _statements(query_stats, lambda: client.get(f"{base}/chapter-1", headers=auth_headers)) == 1
+    assert _statements(query_stats, lambda: client.get("/chapters/chapter-1", headers=auth_headers)) == 1
+
+
+def test_chapter_writes_use_fixed_statement_counts(client, auth_headers, novel, chapters, query_stats):
+    chapters(3)
+    base = f"/novels/{novel.id}/chapters"
+
+    create = lambda: client.post(f"{base}/", json={"title": "新章", "content": "新的内容"}, headers=auth_headers)
+    update = lambda: client.put(f"{base}/chapter-1", json={"content": "改写后的内容"}, headers=auth_headers)
+    delete = lambda: client.delete(f"{base}/chapter-2", headers=auth_headers)
+
+    assert _statements(query_stats, create) == 7
+    assert _statements(query_stats, update) == 7
+    assert _statements(query_stats, delete) == 5
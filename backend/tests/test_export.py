@@ -0,0 +1,33 @@
+import io
+import struct
+import zipfile
+
+from app.models import Chapter
+
+
+def test_epub_export_stores_mimetype_first_without_data_descriptor(client, db, auth_headers, novel):
+    for i in range(1, 4):
+        db.add(Chapter(id=f"chapter-{i}", novel_id=novel.id, title=f"第{i}章", content="天地玄黄。\n" * 50, order=i))
+    db.commit()
+
+    response = client.get(f"/novels/{novel.id}/export", params={"format": "epub"}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    data = response.content
+
+    signature, _version, flags, method, _time, _date, crc, compressed, size, name_length, extra_length = struct.unpack(
+        "<IHHHHHIIIHH", data[:30]
+    )
+    assert signature == 0x04034B50
+    assert flags & 0x08 == 0
+    assert method == zipfile.ZIP_STORED
+    assert compressed == size == len(b"application/epub+zip")
+    assert crc != 0
+    assert extra_length == 0
+    assert data[30 : 30 + name_length] == b"mimetype"
+    assert data[30 + name_length : 30 + name_length + size] == b"application/epub+zip"
+
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    assert archive.testzip() is None
+    assert all(info.flag_bits & 0x08 == 0 for info in archive.infolist())
+    assert [info.filename for info in archive.infolist()][:2] == ["mimetype", "META-INF/container.xml"]
+    assert "OEBPS/chapter-00003.xhtml" in archive.namelist()
@@ -0,0 +1,58 @@
+import re
+
+import pytest
+
+from app.config import get_settings
+from app.models import Chapter, Novel
+from app.services import search_service
+from app.services.import_service import split_chapters
+
+
+@pytest.fixture
+def heading():
+    return re.compile(get_settings().chapter_import_heading_pattern)
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["第一章", "第一章 风起", "第1章：开始", "第十二回　大闹天宫", "第5节-考试", "序章", "楔子 旧事", "番外·一", "尾声"],
+)
+def test_heading_pattern_matches_headings(heading, line):
+    assert heading.match(line)
+
+
+@pytest.mark.parametrize(
+    "line",
+    ["第二节课上老师来了。", "第一回合他就输了", "第三章 他说：“走吧。”", "第一章 他来了！", "番外篇的故事，"],
+)
+def test_heading_pattern_skips_prose(heading, line):
+    assert not heading.match(line)
+
+
+def test_split_chapters_drops_empty_bodies(heading):
+    lines = ["第一章 风起", "", "第二章 云涌", "山雨欲来。", "第二节课上老师来了。", "第三章 尾", "   "]
+
+    chapters = list(split_chapters(((line, False) for line in lines), heading, "正文"))
+
+    assert chapters == [("第二章 云涌", "山雨欲来。\n第二节课上老师来了。")]
+
+
+def test_import_creates_chapters_and_indexes_them(client, db, auth_headers, novel):
+    manuscript = "前言部分\n\n第一章 风起\n青衫少年出山。\n\n第二章\n\n第三章 云涌\n白衣剑客下山。\n".encode("utf-8")
+
+    response = client.post(
+        f"/novels/{novel.id}/import",
+        files={"file": ("书.txt", manuscript, "text/plain")},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 201, response.text
+    assert response.json()["imported"] == 3
+    chapters = db.query(Chapter).filter(Chapter.novel_id == novel.id).order_by(Chapter.order).all()
+    assert [chapter.title for chapter in chapters] == ["书", "第一章 风起", "第三章 云涌"]
+    db.expire_all()
+    assert db.get(Novel, novel.id).chapter_count == 3
+
+    assert search_service.flush_search_index() == 3
+    hits = client.get("/search/", params={"q": "剑客"}, headers=auth_headers).json()
+    assert [hit["id"] for hit in hits] == [chapters[2].id]
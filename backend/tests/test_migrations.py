@@ -0,0 +1,91 @@
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.models import Chapter, Character, Novel, Outline, User
+from app.services import list_chapter_index, list_chapters, list_characters, list_novels, list_outlines
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrated.db'}")
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    config.attributes["configure_logger"] = False
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def seeded(migrated_engine):
+    with Session(migrated_engine) as db:
+        for u in range(3):
+            db.add(User(id=f"user-{u}", email=f"user{u}@example.com", password="!"))
+            for n in range(5):
+                novel_id = f"novel-{u}-{n}"
+                db.add(Novel(id=novel_id, title=novel_id, user_id=f"user-{u}"))
+                for i in range(10):
+                    db.add(Chapter(id=f"{novel_id}-c{i}", novel_id=novel_id, title="t", content="x", order=i))
+                    db.add(Outline(id=f"{novel_id}-o{i}", novel_id=novel_id, title="t", order=i))
+                    db.add(Character(id=f"{novel_id}-p{i}", novel_id=novel_id, name="n"))
+        db.commit()
+    return migrated_engine
+
+
+def _query_plans(engine, call) -> list[str]:
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as db:
+            call(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    plans = []
+    with engine.connect() as connection:
+        for statement, parameters in captured:
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append(" | ".join(row[-1] for row in rows))
+    return plans
+
+
+def test_migrations_create_the_hot_path_indexes(migrated_engine):
+    inspector = inspect(migrated_engine)
+    assert {"ix_chapters_novel_order_created"} <= {i["name"] for i in inspector.get_indexes("chapters")}
+    assert {"ix_novels_user_banned_created", "ix_novels_updated", "ix_novels_created"} <= {
+        i["name"] for i in inspector.get_indexes("novels")
+    }
+    assert "ix_outlines_novel_order_created" in {i["name"] for i in inspector.get_indexes("outlines")}
+    assert "ix_characters_novel_created" in {i["name"] for i in inspector.get_indexes("characters")}
+    with migrated_engine.connect() as connection:
+        assert connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+@pytest.mark.parametrize(
+    "call, index",
+    [
+        (lambda db: list_novels(db, "user-1", 20), "ix_novels_user_banned_created"),
+        (lambda db: list_chapters(db, "user-1", "novel-1-2", 20), "ix_chapters_novel_order_created"),
+        (lambda db: list_chapter_index(db, "user-1", "novel-1-2"), "ix_chapters_novel_order_created"),
+        (lambda db: list_outlines(db, "user-1", "novel-1-2", 20), "ix_outlines_novel_order_created"),
+        (lambda db: list_characters(db, "user-1", "novel-1-2", 20), "ix_characters_novel_created"),
+    ],
+)
+def test_hot_queries_use_indexes(seeded, call, index):
+    plans = _query_plans(seeded, call)
+    assert plans
+    assert any(index in plan for plan in plans), plans
+    assert not any("SCAN chapters" in plan or "SCAN novels" in plan for plan in plans), plans
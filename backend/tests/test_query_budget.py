@@ -0,0 +1,21 @@
+import pytest
+
+
+@pytest.mark.query_budget(2)
+def test_novel_detail_within_budget(client, auth_headers, novel):
+    response = client.get(f"/novels/{novel.id}", headers=auth_headers)
+    assert response.status_code == 200
+
+
+def test_budget_fails_when_exceeded(client, auth_headers, novel, query_budget):
+    with pytest.raises(pytest.fail.Exception, match="budget is 0"):
+        with query_budget(0):
+            client.get(f"/novels/{novel.id}", headers=auth_headers)
+
+
+def test_budget_reports_repeated_shapes(client, auth_headers, novel, query_budget):
+    with pytest.raises(pytest.fail.Exception) as excinfo:
+        with query_budget(1):
+            for _ in range(3):
+                client.get(f"/novels/{novel.id}", headers=auth_headers)
+    assert "3x SELECT" in str(excinfo.value)
@@ -0,0 +1,86 @@
+import pytest
+
+from app.config import get_settings
+from app.models import SearchPosting
+from app.services import search_service
+
+
+@pytest.fixture(autouse=True)
+def slow_reindex(monkeypatch):
+    monkeypatch.setattr(get_settings(), "search_index_delay_seconds", 60.0)
+
+
+def _search(client, auth_headers, q):
+    response = client.get("/search/", params={"q": q}, headers=auth_headers)
+    assert response.status_code == 200, response.text
+    return [hit["id"] for hit in response.json()]
+
+
+def test_chapter_is_indexed_after_commit(client, db, auth_headers, novel):
+    base = f"/novels/{novel.id}/chapters"
+    chapter_id = client.post(f"{base}/", json={"title": "开篇", "content": "青衫少年"}, headers=auth_headers).json()["id"]
+
+    assert db.query(SearchPosting).count() == 0
+    assert search_service._pending_docs == {("chapter", chapter_id)}
+
+    assert search_service.flush_search_index() == 1
+    assert _search(client, auth_headers, "青衫") == [chapter_id]
+
+    client.put(f"{base}/{chapter_id}", json={"content": "白衣剑客"}, headers=auth_headers)
+    client.put(f"{base}/{chapter_id}", json={"content": "白衣剑客再临"}, headers=auth_headers)
+    assert search_service._pending_docs == {("chapter", chapter_id)}
+    search_service.flush_search_index()
+
+    assert _search(client, auth_headers, "青衫") == []
+    assert _search(client, auth_headers, "剑客") == [chapter_id]
+
+
+def test_unchanged_save_does_not_reindex(client, auth_headers, novel):
+    base = f"/novels/{novel.id}/chapters"
+    chapter = client.post(f"{base}/", json={"title": "开篇", "content": "青衫少年"}, headers=auth_headers).json()
+    search_service.flush_search_index()
+
+    response = client.put(
+        f"{base}/{chapter['id']}", json={"title": "开篇", "content": "青衫少年", "status": "published"}, headers=auth_headers
+    )
+    assert response.status_code == 200, response.text
+
+    assert search_service._pending_docs == set()
+
+
+def test_deleted_chapter_is_unindexed_immediately(client, auth_headers, novel):
+    base = f"/novels/{novel.id}/chapters"
+    chapter_id = client.post(f"{base}/", json={"title": "开篇", "content": "青衫少年"}, headers=auth_headers).json()["id"]
+    search_service.flush_search_index()
+
+    assert client.delete(f"{base}/{chapter_id}", headers=auth_headers).status_code < 300
+
+    assert _search(client, auth_headers, "青衫") == []
+
+
+def test_failed_reindex_is_requeued(client, auth_headers, novel, monkeypatch):
+    base = f"/novels/{novel.id}/chapters"
+    chapter_id = client.post(f"{base}/", json={"title": "开篇", "content": "青衫少年"}, headers=auth_headers).json()["id"]
+    reindex = search_service.reindex_documents
+
+    def broken(db, keys):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(search_service, "reindex_documents", broken)
+    assert search_service.flush_search_index() == 0
+    assert search_service._pending_docs == {("chapter", chapter_id)}
+    assert search_service._flush_timer is not None
+
+    monkeypatch.setattr(search_service, "reindex_documents", reindex)
+    assert search_service.flush_search_index() == 1
+    assert search_service._failures == 0
+    assert _search(client, auth_headers, "青衫") == [chapter_id]
+
+
+def test_single_character_query_matches_every_position(client, auth_headers, novel):
+    base = f"/novels/{novel.id}/chapters"
+    chapter_id = client.post(f"{base}/", json={"title": "开篇", "content": "青衫少年"}, headers=auth_headers).json()["id"]
+    search_service.flush_search_index()
+
+    for q in ("青", "衫", "年"):
+        assert _search(client, auth_headers, q) == [chapter_id]
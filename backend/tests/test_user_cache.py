@@ -0,0 +1,62 @@
+import asyncio
+
+from app.models import User
+from app.schemas import AdminUserUpdate
+from app.services import update_admin_user, user_cache
+from app.utils.security import create_access_token
+
+
+class RecordingCache(user_cache.LocalUserCache):
+    def __init__(self):
+        super().__init__(ttl_seconds=60, max_entries=100)
+        self.calls: list[tuple[str, str]] = []
+
+    async def get(self, user_id):
+        self.calls.append(("get", user_id))
+        return await super().get(user_id)
+
+    async def set(self, user):
+        self.calls.append(("set", user.id))
+        await super().set(user)
+
+    async def delete(self, user_id):
+        self.calls.append(("delete", user_id))
+        await super().delete(user_id)
+
+
+def test_cached_user_skips_the_database(client, auth_headers, query_stats, monkeypatch):
+    cache = RecordingCache()
+    monkeypatch.setattr(user_cache, "_user_cache", cache)
+
+    assert client.get("/auth/me", headers=auth_headers).status_code == 200
+    before = query_stats.count
+    assert client.get("/auth/me", headers=auth_headers).status_code == 200
+
+    assert query_stats.count == before
+    assert cache.calls == [("get", "user-1"), ("set", "user-1"), ("get", "user-1")]
+
+
+def test_admin_update_invalidates_cached_user(client, db, user, auth_headers, monkeypatch):
+    cache = RecordingCache()
+    monkeypatch.setattr(user_cache, "_user_cache", cache)
+    db.add(User(id="admin-1", email="admin@example.com", password="!", is_admin=True))
+    db.commit()
+    admin_headers = {"Authorization": f"Bearer {create_access_token('admin-1')}"}
+
+    assert client.get("/auth/me", headers=auth_headers).status_code == 200
+    response = client.patch(f"/admin/users/{user.id}", json={"is_banned": True}, headers=admin_headers)
+    assert response.status_code == 200, response.text
+
+    assert ("delete", user.id) in cache.calls
+    assert client.get("/auth/me", headers=auth_headers).status_code == 403
+
+
+def test_admin_update_invalidates_without_event_loop(db, user, monkeypatch):
+    cache = user_cache.LocalUserCache(ttl_seconds=60, max_entries=100)
+    monkeypatch.setattr(user_cache, "_user_cache", cache)
+    asyncio.run(cache.set(user_cache.CachedUser.from_user(user)))
+
+    update_admin_user(db, user, AdminUserUpdate(is_banned=True))
+    db.commit()
+
+    assert asyncio.run(cache.get(user.id)) is None